@@ -15,7 +15,10 @@
 # limitations under the License.
 
 import contextlib
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 import hydra
@@ -23,8 +26,8 @@ from omegaconf import OmegaConf, DictConfig
 from hydra.utils import to_absolute_path
 import torch
 import torch._dynamo
+import torch._inductor.config
 from torch.distributed import gather
-import numpy as np
 import nvtx
 import netCDF4 as nc
 from physicsnemo.distributed import DistributedManager
@@ -43,8 +46,9 @@ from physicsnemo.utils.corrdiff import (
 )
 
 from helpers.generate_helpers import (
+    configure_cuda_for_fast_inference,
     get_dataset_and_sampler,
-    save_images,
+    save_images_after_event,
 )
 from helpers.train_helpers import set_patch_shape
 from datasets.dataset import register_dataset
@@ -60,6 +64,7 @@ def main(cfg: DictConfig) -> None:
     DistributedManager.initialize()
     dist = DistributedManager()
     device = dist.device
+    configure_cuda_for_fast_inference()
 
     # Initialize logger
     logger = PythonLogger("generate")  # General python logger
@@ -67,12 +72,22 @@ def main(cfg: DictConfig) -> None:
     logger.file_logging("generate.log")
 
     # Handle the batch size
-    seeds = list(np.arange(cfg.generation.num_ensembles))
+    num_seeds = cfg.generation.num_ensembles
     num_batches = (
-        (len(seeds) - 1) // (cfg.generation.seed_batch_size * dist.world_size) + 1
+        (num_seeds - 1) // (cfg.generation.seed_batch_size * dist.world_size) + 1
     ) * dist.world_size
-    all_batches = torch.as_tensor(seeds).tensor_split(num_batches)
+    # Split the seeds into num_batches contiguous ranges, the first
+    # num_seeds % num_batches of them holding one extra seed
+    batch_sizes = [
+        num_seeds // num_batches + (i < num_seeds % num_batches)
+        for i in range(num_batches)
+    ]
+    batch_starts = [sum(batch_sizes[:i]) for i in range(num_batches)]
+    all_batches = [
+        range(start, start + size) for start, size in zip(batch_starts, batch_sizes)
+    ]
     rank_batches = all_batches[dist.rank :: dist.world_size]
+    rank_num_seeds = sum(map(len, rank_batches))
 
     # Synchronize
     if dist.world_size > 1:
@@ -145,7 +160,9 @@ def main(cfg: DictConfig) -> None:
         )
         net_res.profile_mode = getattr(cfg.generation.perf, "profile_mode", False)
         net_res.use_fp16 = getattr(cfg.generation.perf, "use_fp16", False)
-        net_res = net_res.eval().to(device).to(memory_format=torch.channels_last)
+        net_res = net_res.to(
+            device=device, memory_format=torch.channels_last, non_blocking=True
+        ).eval()
 
         # Disable AMP for inference (even if model is trained with AMP)
         if hasattr(net_res, "amp_mode"):
@@ -165,7 +182,9 @@ def main(cfg: DictConfig) -> None:
         )
         net_reg.profile_mode = getattr(cfg.generation.perf, "profile_mode", False)
         net_reg.use_fp16 = getattr(cfg.generation.perf, "use_fp16", False)
-        net_reg = net_reg.eval().to(device).to(memory_format=torch.channels_last)
+        net_reg = net_reg.to(
+            device=device, memory_format=torch.channels_last, non_blocking=True
+        ).eval()
 
         # Disable AMP for inference (even if model is trained with AMP)
         if hasattr(net_reg, "amp_mode"):
@@ -173,14 +192,28 @@ def main(cfg: DictConfig) -> None:
     else:
         net_reg = None
 
-    # Reset since we are using a different mode.
+    # Compile the networks. The on-disk Inductor and FX graph caches let
+    # subsequent runs reuse the kernels generated by a previous run.
     if cfg.generation.perf.use_torch_compile:
+        os.environ.setdefault(
+            "TORCHINDUCTOR_CACHE_DIR", to_absolute_path("./.inductor_cache")
+        )
+        torch._inductor.config.fx_graph_cache = True
+        torch._inductor.config.force_disable_caches = False
         torch._dynamo.config.cache_size_limit = 264
-        torch._dynamo.reset()
+        # The sampler calls the networks repeatedly with identical shapes, so
+        # static graphs are compiled once. Whether they are replayed with CUDA
+        # graphs is left to the compile mode, so it does not leak into other
+        # compiled code in the process
+        compile_mode = getattr(cfg.generation.perf, "compile_mode", "max-autotune")
         if net_res:
-            net_res = torch.compile(net_res)
+            net_res = torch.compile(
+                net_res, mode=compile_mode, dynamic=False, fullgraph=False
+            )
         if net_reg:
-            net_reg = torch.compile(net_reg)
+            net_reg = torch.compile(
+                net_reg, mode=compile_mode, dynamic=False, fullgraph=False
+            )
 
     # Partially instantiate the sampler based on the configs
     if cfg.sampler.type == "deterministic":
@@ -227,81 +260,120 @@ def main(cfg: DictConfig) -> None:
             f"distribution, but got {distribution}."
         )
 
+    # Run the regression model in bfloat16 autocast (CUDA only)
+    autocast_bf16 = (
+        getattr(cfg.generation.perf, "autocast_bf16", False) and device.type == "cuda"
+    )
+
     # Parse P_mean and P_std
     P_mean = getattr(cfg.generation, "P_mean", None)
     P_std = getattr(cfg.generation, "P_std", None)
 
+    # Partially instantiate the diffusion step with the arguments that are
+    # constant over the whole generation
+    diffusion_step_kwargs = {}
+    if distribution is not None:
+        diffusion_step_kwargs["distribution"] = distribution
+    if student_t_nu is not None:
+        diffusion_step_kwargs["nu"] = student_t_nu
+    if P_mean is not None:
+        diffusion_step_kwargs["P_mean"] = P_mean
+    if P_std is not None:
+        diffusion_step_kwargs["P_std"] = P_std
+    diffusion_step_fn = partial(
+        diffusion_step,
+        net=net_res,
+        sampler_fn=sampler_fn,
+        img_shape=img_shape,
+        img_out_channels=img_out_channels,
+        rank_batches=rank_batches,
+        rank=dist.rank,
+        device=device,
+        **diffusion_step_kwargs,
+    )
+
+    # Receive buffer for gathering the outputs on rank 0, allocated on the
+    # first call and reused for every subsequent time step. The per-rank
+    # views into it are passed to gather, so no concatenation is needed.
+    gathered_output = None
+    gathered_tensors = None
+    # Event marking the end of the host copy reading from gathered_output
+    gathered_output_copied = None
+
+    # Computation of the outputs of a time step on the local rank. The
+    # collectives are kept out of it, in generate_fn.
+    def compute_fn():
+        if net_reg:
+            with nvtx.annotate("regression_model", color="yellow"), torch.autocast(
+                device_type=device.type,
+                dtype=torch.bfloat16,
+                enabled=autocast_bf16,
+            ):
+                image_reg = regression_step(
+                    net=net_reg,
+                    img_lr=image_lr,
+                    latents_shape=(
+                        rank_num_seeds,
+                        img_out_channels,
+                        img_shape[0],
+                        img_shape[1],
+                    ),  # (batch_size, C, H, W)
+                    lead_time_label=lead_time_label,
+                )
+            if autocast_bf16:
+                image_reg = image_reg.to(torch.float32)
+        if net_res:
+            if cfg.generation.hr_mean_conditioning:
+                mean_hr = torch.narrow(image_reg, 0, 0, 1)
+            else:
+                mean_hr = None
+            with nvtx.annotate("diffusion model", color="purple"):
+                image_res = diffusion_step_fn(
+                    img_lr=img_lr_rep,
+                    mean_hr=mean_hr,
+                    lead_time_label=lead_time_label,
+                )
+        if cfg.generation.inference_mode == "regression":
+            image_out = image_reg
+        elif cfg.generation.inference_mode == "diffusion":
+            image_out = image_res
+        elif image_res.dtype == torch.promote_types(image_res.dtype, image_reg.dtype):
+            # image_res is freshly allocated by diffusion_step: add in place
+            image_out = image_res.add_(image_reg)
+        else:
+            image_out = image_reg + image_res
+        return image_out
+
     # Main generation definition
     def generate_fn():
+        nonlocal gathered_output, gathered_tensors
         with nvtx.annotate("generate_fn", color="green"):
-
-            diffusion_step_kwargs = {}
-            if distribution is not None:
-                diffusion_step_kwargs["distribution"] = distribution
-            if student_t_nu is not None:
-                diffusion_step_kwargs["nu"] = student_t_nu
-            if P_mean is not None:
-                diffusion_step_kwargs["P_mean"] = P_mean
-            if P_std is not None:
-                diffusion_step_kwargs["P_std"] = P_std
-
-            # (1, C, H, W)
-            img_lr = image_lr.to(memory_format=torch.channels_last)
-
-            if net_reg:
-                with nvtx.annotate("regression_model", color="yellow"):
-                    image_reg = regression_step(
-                        net=net_reg,
-                        img_lr=img_lr,
-                        latents_shape=(
-                            sum(map(len, rank_batches)),
-                            img_out_channels,
-                            img_shape[0],
-                            img_shape[1],
-                        ),  # (batch_size, C, H, W)
-                        lead_time_label=lead_time_label,
-                    )
-            if net_res:
-                if cfg.generation.hr_mean_conditioning:
-                    mean_hr = image_reg[0:1]
-                else:
-                    mean_hr = None
-                with nvtx.annotate("diffusion model", color="purple"):
-                    image_res = diffusion_step(
-                        net=net_res,
-                        sampler_fn=sampler_fn,
-                        img_shape=img_shape,
-                        img_out_channels=img_out_channels,
-                        rank_batches=rank_batches,
-                        img_lr=img_lr.expand(
-                            cfg.generation.seed_batch_size, -1, -1, -1
-                        ).to(memory_format=torch.channels_last),
-                        rank=dist.rank,
-                        device=device,
-                        mean_hr=mean_hr,
-                        lead_time_label=lead_time_label,
-                        **diffusion_step_kwargs,
-                    )
-            if cfg.generation.inference_mode == "regression":
-                image_out = image_reg
-            elif cfg.generation.inference_mode == "diffusion":
-                image_out = image_res
-            else:
-                image_out = image_reg + image_res
+            image_out = compute_fn()
 
             # Gather tensors on rank 0
             if dist.world_size > 1:
+                # gather copies the raw memory of each rank's tensor into the
+                # channels last receive views, so every rank sends that layout.
+                # The regression outputs repeated over the seeds, for example,
+                # are contiguous. This is a no-op for channels last outputs.
+                image_out = image_out.contiguous(memory_format=torch.channels_last)
                 if dist.rank == 0:
-                    gathered_tensors = [
-                        torch.zeros_like(
-                            image_out, dtype=image_out.dtype, device=image_out.device
+                    if gathered_output is None:
+                        gathered_output = torch.empty(
+                            (
+                                dist.world_size * image_out.shape[0],
+                                *image_out.shape[1:],
+                            ),
+                            dtype=image_out.dtype,
+                            device=image_out.device,
+                            memory_format=torch.channels_last,
                         )
-                        for _ in range(dist.world_size)
-                    ]
-                else:
-                    gathered_tensors = None
+                        gathered_tensors = list(gathered_output.chunk(dist.world_size))
+                    # Do not overwrite the previous output before it is copied
+                    if gathered_output_copied is not None:
+                        torch.cuda.current_stream().wait_event(gathered_output_copied)
 
-                torch.distributed.barrier()
+                # gather is a collective and synchronizes the ranks by itself
                 gather(
                     image_out,
                     gather_list=gathered_tensors if dist.rank == 0 else None,
@@ -309,7 +381,7 @@ def main(cfg: DictConfig) -> None:
                 )
 
                 if dist.rank == 0:
-                    return torch.cat(gathered_tensors)
+                    return gathered_output
                 else:
                     return None
             else:
@@ -343,8 +415,15 @@ def main(cfg: DictConfig) -> None:
     with torch_cuda_profiler:
         with torch_nvtx_profiler:
 
+            dataloader_workers = getattr(cfg.generation.perf, "dataloader_workers", 2)
             data_loader = torch.utils.data.DataLoader(
-                dataset=dataset, sampler=sampler, batch_size=1, pin_memory=True
+                dataset=dataset,
+                sampler=sampler,
+                batch_size=1,
+                pin_memory=True,
+                num_workers=dataloader_workers,
+                persistent_workers=dataloader_workers > 0,
+                prefetch_factor=4 if dataloader_workers > 0 else None,
             )
             time_index = -1
             if dist.rank == 0:
@@ -357,32 +436,41 @@ def main(cfg: DictConfig) -> None:
                     has_lead_time=has_lead_time,
                 )
 
+                # Writers are threads rather than processes: they all write
+                # through the same open netCDF4 handle, which cannot be shared
+                # with other processes
                 if cfg.generation.perf.io_syncronous:
                     writer_executor = ThreadPoolExecutor(
                         max_workers=cfg.generation.perf.num_writer_workers
                     )
-                    writer_threads = []
+                    # Bound the number of pending writes, so that the host
+                    # memory held by their inputs stays bounded under slow
+                    # storage
+                    writer_threads = deque()
+                    max_pending_writes = 2 * cfg.generation.perf.num_writer_workers
+
+                # Pinned host buffers receiving the outputs through asynchronous
+                # copies on a side stream, so that the device-to-host transfer
+                # overlaps with the next generation step. There is one buffer
+                # per pending write, and the buffers are used in turn: the write
+                # reading from a buffer has completed by the time it is reused.
+                use_async_copy = torch.cuda.is_available()
+                if use_async_copy:
+                    copy_stream = torch.cuda.Stream()
+                    num_host_buffers = (
+                        max_pending_writes if cfg.generation.perf.io_syncronous else 1
+                    )
+                    host_buffers = [None] * num_host_buffers
 
-            # Create timer objects only if CUDA is available
+            # Time the steps after warmup with CUDA events if CUDA is
+            # available, and with the host clock otherwise
             use_cuda_timing = torch.cuda.is_available()
             if use_cuda_timing:
                 start = torch.cuda.Event(enable_timing=True)
                 end = torch.cuda.Event(enable_timing=True)
-            else:
-                # Dummy no-op functions for CPU case
-                class DummyEvent:
-                    def record(self):
-                        pass
-
-                    def synchronize(self):
-                        pass
-
-                    def elapsed_time(self, _):
-                        return 0
 
-                start = end = DummyEvent()
-
-            times = dataset.time()
+            times_list = list(dataset.time())
+            img_lr_rep = None
             for index, (image_tar, image_lr, *lead_time_label) in enumerate(
                 iter(data_loader)
             ):
@@ -391,57 +479,116 @@ def main(cfg: DictConfig) -> None:
                     logger0.info(f"starting index: {time_index}")
 
                 if time_index == warmup_steps:
-                    start.record()
+                    if use_cuda_timing:
+                        start.record()
+                    else:
+                        start_time = time.perf_counter()
 
                 # continue
                 if lead_time_label:
                     lead_time_label = lead_time_label[0].to(dist.device).contiguous()
                 else:
                     lead_time_label = None
-                image_lr = (
-                    image_lr.to(device=device)
-                    .to(torch.float32)
-                    .to(memory_format=torch.channels_last)
+                image_lr = image_lr.to(
+                    device=device, dtype=torch.float32, non_blocking=True
+                ).contiguous(memory_format=torch.channels_last)
+                image_tar = image_tar.to(
+                    device=device, dtype=torch.float32, non_blocking=True
                 )
-                image_tar = image_tar.to(device=device).to(torch.float32)
+                # Tile image_lr along the seed batch dimension for the
+                # diffusion model, once per input into a reused buffer
+                if net_res:
+                    if img_lr_rep is None:
+                        img_lr_rep = torch.empty(
+                            (cfg.generation.seed_batch_size, *image_lr.shape[1:]),
+                            dtype=image_lr.dtype,
+                            device=image_lr.device,
+                            memory_format=torch.channels_last,
+                        )
+                    img_lr_rep.copy_(image_lr.expand_as(img_lr_rep))
                 image_out = generate_fn()
                 if dist.rank == 0:
                     batch_size = image_out.shape[0]
+                    if (
+                        cfg.generation.perf.io_syncronous
+                        and len(writer_threads) >= max_pending_writes
+                    ):
+                        writer_threads.popleft().result()
+                    if use_async_copy:
+                        slot = index % num_host_buffers
+                        device_images = (image_out, image_tar, image_lr)
+                        if host_buffers[slot] is None:
+                            host_buffers[slot] = [
+                                torch.empty_like(x, device="cpu", pin_memory=True)
+                                for x in device_images
+                            ]
+                        copy_stream.wait_stream(torch.cuda.current_stream())
+                        with torch.cuda.stream(copy_stream):
+                            for host_image, device_image in zip(
+                                host_buffers[slot], device_images
+                            ):
+                                host_image.copy_(device_image, non_blocking=True)
+                                device_image.record_stream(copy_stream)
+                            copy_done = torch.cuda.Event()
+                            copy_done.record()
+                        gathered_output_copied = copy_done
+                        host_out, host_tar, host_lr = host_buffers[slot]
+                    else:
+                        # The gathered output buffer is overwritten by the next step
+                        copy_done = None
+                        host_out, host_tar, host_lr = (
+                            image_out.clone() if dist.world_size > 1 else image_out,
+                            image_tar,
+                            image_lr,
+                        )
                     if cfg.generation.perf.io_syncronous:
                         # write out data in a seperate thread so we don't hold up inferencing
                         writer_threads.append(
                             writer_executor.submit(
-                                save_images,
+                                save_images_after_event,
+                                copy_done,
                                 writer,
                                 dataset,
-                                list(times),
-                                image_out.cpu(),
-                                image_tar.cpu(),
-                                image_lr.cpu(),
+                                times_list,
+                                host_out,
+                                host_tar,
+                                host_lr,
                                 time_index,
                                 index,
                                 has_lead_time,
                             )
                         )
                     else:
-                        save_images(
+                        save_images_after_event(
+                            copy_done,
                             writer,
                             dataset,
-                            list(times),
-                            image_out.cpu(),
-                            image_tar.cpu(),
-                            image_lr.cpu(),
+                            times_list,
+                            host_out,
+                            host_tar,
+                            host_lr,
                             time_index,
                             index,
                             has_lead_time,
                         )
-            end.record()
-            end.synchronize()
-            elapsed_time = (
-                start.elapsed_time(end) / 1000.0 if use_cuda_timing else 0
-            )  # Convert ms to s
+            if use_cuda_timing:
+                end.record()
+            else:
+                elapsed_time = time.perf_counter() - start_time
+
+            # make sure all the workers are done writing
+            if dist.rank == 0 and cfg.generation.perf.io_syncronous:
+                while writer_threads:
+                    writer_threads.popleft().result()
+                writer_executor.shutdown()
+
+            # Synchronize on the end event only after the writers are done, so
+            # that the last writes overlap with the remaining device work
+            if use_cuda_timing:
+                end.synchronize()
+                elapsed_time = start.elapsed_time(end) / 1000.0  # Convert ms to s
             timed_steps = time_index + 1 - warmup_steps
-            if dist.rank == 0 and use_cuda_timing:
+            if dist.rank == 0:
                 average_time_per_batch_element = elapsed_time / timed_steps / batch_size
                 logger.info(
                     f"Total time to run {timed_steps} steps and {batch_size} members = {elapsed_time} s"
@@ -450,13 +597,6 @@ def main(cfg: DictConfig) -> None:
                     f"Average time per batch element = {average_time_per_batch_element} s"
                 )
 
-            # make sure all the workers are done writing
-            if dist.rank == 0 and cfg.generation.perf.io_syncronous:
-                for thread in list(writer_threads):
-                    thread.result()
-                    writer_threads.remove(thread)
-                writer_executor.shutdown()
-
     if dist.rank == 0:
         f.close()
     logger0.info("Generation Completed.")
@@ -16,6 +16,8 @@
 
 import datetime
 
+import torch
+
 from physicsnemo.utils.diffusion import convert_datetime_to_cftime
 
 from datasets.dataset import init_dataset_from_config
@@ -43,6 +45,20 @@ def get_dataset_and_sampler(dataset_cfg, times, has_lead_time=False):
     return dataset, sampler
 
 
+def configure_cuda_for_fast_inference():
+    """
+    Configures CUDA and cuDNN settings for inference throughput by enabling
+    cuDNN autotuning, TensorFloat-32 (TF32) and reduced precision settings.
+    """
+    torch.backends.cudnn.benchmark = True
+    torch.backends.cudnn.allow_tf32 = True
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cuda.matmul.allow_fp16_reduced_precision_reduction = True
+    # Only available in recent PyTorch versions
+    if hasattr(torch.backends.cuda.matmul, "allow_fp16_accumulation"):
+        torch.backends.cuda.matmul.allow_fp16_accumulation = True
+
+
 def save_images(
     writer,
     dataset: DownscalingDataset,
@@ -114,3 +130,25 @@ def save_images(
             writer.write_input(channel_name, time_index, image_lr2[0, channel_idx])
             if channel_idx == image_lr2.shape[1] - 1:
                 break
+
+
+def save_images_after_event(event, *args):
+    """
+    Waits for a CUDA event, then saves the inferencing results with
+    ``save_images``
+
+    Used to write results that are copied to host memory asynchronously: the
+    event is recorded after the copies, so the images can only be read once
+    it has completed. The wait happens in the caller (typically a writer
+    thread), which leaves the main thread free to launch the next step.
+
+    Parameters
+    ----------
+
+    event (torch.cuda.Event or None): Event to wait for. If None, the images
+        are saved immediately
+    *args: Arguments passed to ``save_images``
+    """
+    if event is not None:
+        event.synchronize()
+    save_images(*args)
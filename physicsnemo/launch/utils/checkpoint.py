@@ -14,10 +14,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
+import hashlib
+import io
+import json
 import os
-import re
+import socket
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path, PurePath
-from typing import Any, Dict, List, NewType, Optional, Union
+from typing import Any, Dict, List, NewType, Optional, Tuple, Union
 
 import fsspec
 import fsspec.utils
@@ -31,12 +39,75 @@ from physicsnemo.launch.logging import PythonLogger
 from physicsnemo.utils.capture import _StaticCapture
 from physicsnemo.utils.filesystem import LOCAL_CACHE, _download_cached
 
+try:
+    from torch.utils.serialization import config as serialization_config
+except ImportError:  # PyTorch < 2.5
+    serialization_config = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
 optimizer = NewType("optimizer", torch.optim)
 scheduler = NewType("scheduler", _LRScheduler)
 scaler = NewType("scaler", GradScaler)
 
 checkpoint_logging = PythonLogger("checkpoint")
 
+# Background writer for asynchronous checkpoint saves, created on first use
+_async_save_executor: Optional[ThreadPoolExecutor] = None
+_pending_saves: List[Future] = []
+
+# Largest checkpoint index for each (path, base name, model parallel rank, file
+# extension), populated by directory listings and kept up to date by saves
+_checkpoint_index_cache: Dict[Tuple[str, str, int, str], int] = {}
+
+# Unique model names of the last save to each path, along with weak references to the
+# saved models, so that the plans do not keep the models alive
+_save_plans: Dict[str, Tuple[Tuple[weakref.ref, ...], Dict[str, weakref.ref]]] = {}
+
+# Pinned host buffers kept to stage device tensors when saving, for each saved model or
+# optimizer, for asynchronous saves or when requested. They are reused by later saves of
+# the same object and released along with it
+_pinned_buffers: "weakref.WeakKeyDictionary[Any, Dict[Any, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Last full snapshot of each model saved incrementally, for each (path, model name):
+# file name of the snapshot, host copy of its tensors, and size and SHA-256 digest of
+# the written file, which are None until it is written
+_incremental_snapshots: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+# Key holding the file name of the full snapshot in incremental model checkpoints
+_INCREMENTAL_BASE_KEY = "__incremental_base__"
+
+# The torch.save options are global, so patching them must not overlap across threads
+_serialization_lock = threading.Lock()
+
+# File info entries identifying the version of a remote file, across fsspec backends
+_VERSION_KEYS = (
+    "size",
+    "ETag",
+    "etag",
+    "LastModified",
+    "last_modified",
+    "mtime",
+    "created",
+)
+
+# Upload part size for object stores, so checkpoints are written in few large parts
+_UPLOAD_BLOCK_SIZE = 64 * 1024 * 1024
+
+
+def _initialize_distributed_manager() -> None:
+    """Initializes the DistributedManager if it is not initialized already"""
+    if not DistributedManager.is_initialized():
+        checkpoint_logging.warning(
+            "`DistributedManager` not initialized already. Initializing now, but this might lead to unexpected errors"
+        )
+        DistributedManager.initialize()
+
 
 def _get_checkpoint_filename(
     path: str,
@@ -77,11 +148,7 @@ def _get_checkpoint_filename(
     # can save their checkpoint. In the case without model parallelism,
     # model_parallel_rank should be the same as the process rank itself and
     # only rank 0 saves
-    if not DistributedManager.is_initialized():
-        checkpoint_logging.warning(
-            "`DistributedManager` not initialized already. Initializing now, but this might lead to unexpected errors"
-        )
-        DistributedManager.initialize()
+    _initialize_distributed_manager()
     manager = DistributedManager()
     model_parallel_rank = (
         manager.group_rank("model_parallel")
@@ -100,40 +167,49 @@ def _get_checkpoint_filename(
     # File extension for PhysicsNeMo models or PyTorch models
     file_extension = ".mdlus" if model_type == "mdlus" else ".pt"
 
+    cache_key = (path, base_name, model_parallel_rank, file_extension)
+
     # If epoch is provided load that file
     if index is not None:
         checkpoint_filename = checkpoint_filename + f".{index}"
         checkpoint_filename += file_extension
+        if saving and cache_key in _checkpoint_index_cache:
+            _checkpoint_index_cache[cache_key] = max(
+                _checkpoint_index_cache[cache_key], index
+            )
     # Otherwise try loading the latest epoch or rolling checkpoint
     else:
-        file_names = [
-            fname for fname in fs.glob(checkpoint_filename + "*" + file_extension)
-        ]
+        # Largest index of the existing checkpoints, -1 if there are none. Loading
+        # always lists the directory, so checkpoints written by other processes are
+        # found, while repeated saves reuse the cached index.
+        if saving and cache_key in _checkpoint_index_cache:
+            max_idx = _checkpoint_index_cache[cache_key]
+        else:
+            max_idx = -1
+            # Parse "{base_name}.{model_parallel_rank}.{index}{file_extension}"
+            prefix = f"{base_name}.{model_parallel_rank}."
+            for fname in fs.glob(checkpoint_filename + "*" + file_extension):
+                file_stem = PurePath(fname).name
+                if not (
+                    file_stem.startswith(prefix) and file_stem.endswith(file_extension)
+                ):
+                    continue
+                file_index = file_stem[len(prefix) : -len(file_extension)]
+                if file_index.isdecimal():
+                    max_idx = max(max_idx, int(file_index))
+            _checkpoint_index_cache[cache_key] = max_idx
 
-        if len(file_names) > 0:
-            # If checkpoint from a null index save exists load that
-            # This is the most likely line to error since it will fail with
-            # invalid checkpoint names
-
-            file_idx = []
-
-            for fname in file_names:
-                fname_path = PurePath(fname)
-                file_stem = fname_path.name
-
-                pattern = rf"^{re.escape(base_name)}\.{model_parallel_rank}\.(\d+){re.escape(file_extension)}$"
-                match = re.match(pattern, file_stem)
-                if match:
-                    file_idx.append(int(match.group(1)))
-            file_idx.sort()
-            # If we are saving index by 1 to get the next free file name
-            if saving:
-                checkpoint_filename = checkpoint_filename + f".{file_idx[-1] + 1}"
-            else:
-                checkpoint_filename = checkpoint_filename + f".{file_idx[-1]}"
-            checkpoint_filename += file_extension
+        if saving:
+            _checkpoint_index_cache[cache_key] = max_idx + 1
+
+        if max_idx == -1:
+            checkpoint_filename += ".0"
+        # If we are saving index by 1 to get the next free file name
+        elif saving:
+            checkpoint_filename += f".{max_idx + 1}"
         else:
-            checkpoint_filename += ".0" + file_extension
+            checkpoint_filename += f".{max_idx}"
+        checkpoint_filename += file_extension
 
     return checkpoint_filename
 
@@ -157,8 +233,9 @@ def _unique_model_names(
     Dict[str, torch.nn.Module]
         Dictionary of model names and respective modules
     """
-    # Loop through provided models and set up base names
-    model_dict = {}
+    # Loop through provided models and set up unique names, in a single pass
+    output_dict = {}
+    name_counts = {}
     for model0 in models:
         if hasattr(model0, "module"):
             # Strip out DDP layer
@@ -179,23 +256,343 @@ def _unique_model_names(
                 f"Model {base_name} is already compiled, consider loading first and then compiling."
             )
         # If we have multiple models of the same name, introduce another index
-        if base_name in model_dict:
-            model_dict[base_name].append(model0)
+        count = name_counts.get(base_name, 0)
+        if count == 0:
+            output_dict[base_name] = model0
         else:
-            model_dict[base_name] = [model0]
-
-    # Set up unique model names if needed
-    output_dict = {}
-    for key, model in model_dict.items():
-        if len(model) > 1:
-            for i, model0 in enumerate(model):
-                output_dict[key + str(i)] = model0
-        else:
-            output_dict[key] = model[0]
+            if count == 1:
+                output_dict[base_name + "0"] = output_dict.pop(base_name)
+            output_dict[base_name + str(count)] = model0
+        name_counts[base_name] = count + 1
 
     return output_dict
 
 
+def _copy_to_cpu(
+    obj: Any,
+    buffers: Optional[Dict[Tuple, torch.Tensor]],
+    clone: bool = True,
+) -> Any:
+    """Recursively copies the tensors of a (nested) state dictionary to host memory
+
+    Device tensors are copied asynchronously to pinned memory buffers, followed by a
+    single synchronization. The buffers are kept in ``buffers``, keyed by the
+    position of the tensor in the state dictionary, and reused by later copies of a
+    state dictionary with the same layout. Without ``buffers``, device tensors are
+    copied to pageable host memory instead.
+
+    Parameters
+    ----------
+    obj : Any
+        State dictionary, or any nesting of dictionaries, lists and tuples of tensors
+        and other objects
+    buffers : Optional[Dict[Tuple, torch.Tensor]]
+        Pinned host buffers of previous copies, updated in place, or None to not use
+        pinned memory
+    clone : bool, optional
+        Also clone host tensors, so that the copy is a snapshot that is not affected
+        by subsequent in-place updates of the training objects, by default True
+
+    Returns
+    -------
+    Any
+        Copy of the input with all tensors on the host
+    """
+
+    def _copy(obj: Any, key: Tuple) -> Any:
+        if isinstance(obj, torch.Tensor):
+            if obj.device.type == "cpu":
+                return obj.detach().clone() if clone else obj
+            if buffers is None:
+                return obj.detach().to("cpu")
+            buffer = buffers.get(key)
+            if buffer is None or buffer.shape != obj.shape or buffer.dtype != obj.dtype:
+                buffer = torch.empty(obj.shape, dtype=obj.dtype, pin_memory=True)
+                buffers[key] = buffer
+            return buffer.copy_(obj.detach(), non_blocking=True)
+        if isinstance(obj, dict):
+            out = OrderedDict() if isinstance(obj, OrderedDict) else {}
+            for name, value in obj.items():
+                out[name] = _copy(value, key + (name,))
+            # Module state dictionaries carry version information used on load
+            if hasattr(obj, "_metadata"):
+                out._metadata = obj._metadata
+            return out
+        if isinstance(obj, list):
+            return [_copy(value, key + (i,)) for i, value in enumerate(obj)]
+        if type(obj) is tuple:
+            return tuple(_copy(value, key + (i,)) for i, value in enumerate(obj))
+        return obj
+
+    out = _copy(obj, ())
+    if torch.cuda.is_initialized():
+        torch.cuda.synchronize()
+    return out
+
+
+def _staging_buffers(
+    owner: Any, use_pinned_memory: bool, keep: bool
+) -> Optional[Dict[Any, Any]]:
+    """Gets the pinned host buffers used to stage the device tensors of a saved object
+
+    Parameters
+    ----------
+    owner : Any
+        Saved model or optimizer, or None
+    use_pinned_memory : bool
+        Stage the device tensors in pinned memory
+    keep : bool
+        Keep the buffers for the next saves of ``owner``, instead of allocating new
+        ones that are released after the save
+
+    Returns
+    -------
+    Optional[Dict[Any, Any]]
+        Buffers, which are empty if they are not kept, or None to not use pinned memory
+    """
+    if not use_pinned_memory:
+        return None
+    if keep and owner is not None:
+        return _pinned_buffers.setdefault(owner, {})
+    return {}
+
+
+def _save_options(
+    compute_crc32: bool, use_pinned_memory: bool
+) -> contextlib.AbstractContextManager:
+    """Context manager setting the torch.save options supported by this PyTorch
+
+    Parameters
+    ----------
+    compute_crc32 : bool
+        Compute the CRC32 checksums of the serialized storages
+    use_pinned_memory : bool
+        Stage device to host copies of the serialized storages in pinned memory
+
+    Returns
+    -------
+    contextlib.AbstractContextManager
+        Context manager patching the serialization config, or a null context for
+        PyTorch versions without these options
+    """
+    if serialization_config is None:
+        return contextlib.nullcontext()
+    options = {
+        "compute_crc32": compute_crc32,
+        "use_pinned_memory_for_d2h": use_pinned_memory,
+    }
+    return serialization_config.patch(
+        {
+            f"save.{key}": value
+            for key, value in options.items()
+            if hasattr(serialization_config.save, key)
+        }
+    )
+
+
+def _save_bytes(
+    obj: Any,
+    file_name: str,
+    fs: fsspec.AbstractFileSystem,
+    options: contextlib.AbstractContextManager,
+    snapshot: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Serializes an object with torch.save to the provided file
+
+    The object is serialized in memory first and written with a single call, instead
+    of the many small writes issued by torch.save, which are slow on object stores.
+    If ``snapshot`` is provided, the size and SHA-256 digest of the written file are
+    recorded in it once the file is written.
+    """
+    buffer = io.BytesIO()
+    with _serialization_lock, options:
+        torch.save(obj, buffer)
+    if "file" in fs.protocol:
+        # Write local files next to their destination and rename them, so readers,
+        # including memory mapped loads, never see a partially written file
+        local_file_name = fs._strip_protocol(file_name)
+        tmp_file_name = f"{local_file_name}.tmp"
+        with open(tmp_file_name, "wb") as fp:
+            fp.write(buffer.getbuffer())
+        os.replace(tmp_file_name, local_file_name)
+    else:
+        open_kwargs = {"block_size": _UPLOAD_BLOCK_SIZE} if "s3" in fs.protocol else {}
+        with fs.open(file_name, "wb", **open_kwargs) as fp:
+            fp.write(buffer.getbuffer())
+    if snapshot is not None:
+        snapshot["size"] = buffer.getbuffer().nbytes
+        snapshot["sha256"] = hashlib.sha256(buffer.getbuffer()).hexdigest()
+
+
+def _save_state_async(
+    obj: Any,
+    file_name: str,
+    fs: fsspec.AbstractFileSystem,
+    options: contextlib.AbstractContextManager,
+    description: str,
+    snapshot: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Serializes a host copy of an object in the background writer thread"""
+    global _async_save_executor
+    if _async_save_executor is None:
+        _async_save_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="checkpoint"
+        )
+
+    def _save() -> None:
+        _save_bytes(obj, file_name, fs, options, snapshot=snapshot)
+        checkpoint_logging.success(f"Saved {description}: {file_name}")
+
+    _pending_saves.append(_async_save_executor.submit(_save))
+
+
+def _wait_for_pending_saves() -> None:
+    """Blocks until all asynchronous checkpoint saves are written"""
+    while _pending_saves:
+        # Re-raises any exception that occurred in the writer
+        _pending_saves.pop(0).result()
+
+
+def _incremental_state_dict(
+    path: str, name: str, file_name: str, state_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Reduces a model state dictionary to the entries changed since its last snapshot
+
+    Tensors are compared with the last full snapshot of the model saved in this
+    process. Version counters are not used, since they are not updated by all in-place
+    modifications (for example running statistics of batch norms). If there is no
+    such snapshot, or if all entries changed, the full state dictionary is returned
+    and a copy of it becomes the new snapshot. Incremental state dictionaries record
+    the size and SHA-256 digest of the snapshot file, so that loads can check that
+    it was not overwritten since, and the keys of the full state dictionary, so that
+    removed entries are not restored from the snapshot.
+
+    Parameters
+    ----------
+    path : str
+        Checkpoint directory
+    name : str
+        Unique model name
+    file_name : str
+        File name the state dictionary is saved to
+    state_dict : Dict[str, Any]
+        Model state dictionary, on the host
+
+    Returns
+    -------
+    Dict[str, Any]
+        Full state dictionary, or the changed entries along with the description of
+        the snapshot they apply to
+    """
+
+    def _unchanged(key: str, value: Any) -> bool:
+        base_value = base_state_dict.get(key)
+        return (
+            isinstance(value, torch.Tensor)
+            and isinstance(base_value, torch.Tensor)
+            and value.dtype == base_value.dtype
+            and torch.equal(value, base_value)
+        )
+
+    snapshot = _incremental_snapshots.get((path, name))
+    # A snapshot that is being overwritten cannot be its own base, and a snapshot
+    # that was not written has no digest
+    if (
+        snapshot is not None
+        and snapshot["file_name"] != PurePath(file_name).name
+        and snapshot["sha256"] is not None
+    ):
+        base_state_dict = snapshot["state_dict"]
+        changed = OrderedDict(
+            (key, value)
+            for key, value in state_dict.items()
+            if not _unchanged(key, value)
+        )
+        if len(changed) < len(state_dict):
+            return {
+                _INCREMENTAL_BASE_KEY: snapshot["file_name"],
+                "base_size": snapshot["size"],
+                "base_sha256": snapshot["sha256"],
+                "keys": list(state_dict),
+                "state_dict": changed,
+            }
+    _incremental_snapshots[(path, name)] = {
+        "file_name": PurePath(file_name).name,
+        "state_dict": {
+            key: value.clone()
+            for key, value in state_dict.items()
+            if isinstance(value, torch.Tensor)
+        },
+        "size": None,
+        "sha256": None,
+    }
+    return state_dict
+
+
+def _save_model(
+    name: str,
+    model: torch.nn.Module,
+    path: str,
+    epoch: Union[int, None],
+    fs: fsspec.AbstractFileSystem,
+    async_save: bool,
+    compute_crc32: bool,
+    use_pinned_memory: bool,
+    incremental: bool,
+    reuse_pinned_buffers: bool,
+) -> None:
+    """Saves the state of a single model of a training checkpoint
+
+    See ``save_checkpoint`` for a description of the parameters. ``name`` is the
+    unique model name used as file base name.
+    """
+    # Get model type
+    model_type = "mdlus" if isinstance(model, physicsnemo.models.Module) else "pt"
+
+    # Get full file path / name
+    file_name = _get_checkpoint_filename(
+        path, name, index=epoch, saving=True, model_type=model_type
+    )
+
+    # Save state dictionary
+    if isinstance(model, physicsnemo.models.Module):
+        with _serialization_lock, _save_options(compute_crc32, use_pinned_memory):
+            model.save(file_name)
+    else:
+        # Stage the device tensors in pinned host memory
+        state_dict = _copy_to_cpu(
+            model.state_dict(),
+            _staging_buffers(
+                model, use_pinned_memory, async_save or reuse_pinned_buffers
+            ),
+            clone=async_save,
+        )
+        snapshot = None
+        if incremental:
+            state_dict = _incremental_state_dict(path, name, file_name, state_dict)
+            if _INCREMENTAL_BASE_KEY not in state_dict:
+                # Full saves are the snapshots of the next incremental ones
+                snapshot = _incremental_snapshots[(path, name)]
+        if async_save:
+            _save_state_async(
+                state_dict,
+                file_name,
+                fs,
+                _save_options(compute_crc32, use_pinned_memory),
+                "model state dictionary",
+                snapshot=snapshot,
+            )
+            return
+        _save_bytes(
+            state_dict,
+            file_name,
+            fs,
+            _save_options(compute_crc32, use_pinned_memory),
+            snapshot=snapshot,
+        )
+    checkpoint_logging.success(f"Saved model state dictionary: {file_name}")
+
+
 def save_checkpoint(
     path: str,
     models: Union[torch.nn.Module, List[torch.nn.Module], None] = None,
@@ -204,6 +601,13 @@ def save_checkpoint(
     scaler: Union[scaler, None] = None,
     epoch: Union[int, None] = None,
     metadata: Optional[Dict[str, Any]] = None,
+    async_save: bool = False,
+    compute_crc32: bool = False,
+    use_pinned_memory: bool = True,
+    incremental: bool = False,
+    quantize_optimizer: bool = False,
+    sharded: bool = False,
+    reuse_pinned_buffers: bool = False,
 ) -> None:
     """Training checkpoint saving utility
 
@@ -223,13 +627,56 @@ def save_checkpoint(
         Learning rate scheduler, by default None
     scaler : Union[scaler, None], optional
         AMP grad scaler. Will attempt to save on in static capture if none provided, by
-        default None
+        default None. Static capture scalers are only saved along with other
+        training state (optimizer, scheduler, scaler, epoch or metadata).
     epoch : Union[int, None], optional
         Epoch checkpoint to load. If none this will save the checkpoint in the next
         valid index, by default None
     metadata : Optional[Dict[str, Any]], optional
         Additional metadata to save, by default None
+    async_save : bool, optional
+        Write the checkpoint in a background thread so that training can resume
+        while it is being written, by default False. The state dictionaries are
+        first copied to host memory, so later updates of the training objects do
+        not affect the saved checkpoint. PhysicsNeMo models are always saved
+        synchronously. Subsequent calls to ``save_checkpoint`` and
+        ``load_checkpoint`` wait for pending writes to complete.
+    compute_crc32 : bool, optional
+        Compute the CRC32 checksums of the serialized tensors, by default False.
+        Ignored by PyTorch versions without this option.
+    use_pinned_memory : bool, optional
+        Stage device to host copies of the saved tensors in pinned memory, by default
+        True. The pinned buffers are allocated for every save, unless
+        ``reuse_pinned_buffers`` or ``async_save`` are set.
+    incremental : bool, optional
+        Only save the tensors of PyTorch models that changed since the last full
+        snapshot of the model saved in this process, by default False. The other
+        tensors are loaded from that snapshot, which must therefore be kept, so that
+        for example frozen parameters are written once. Loading fails if the snapshot
+        is missing or was overwritten. A host copy of the snapshot is kept for the
+        comparison. PhysicsNeMo models are always saved in full.
+    quantize_optimizer : bool, optional
+        Save the fp32 moment estimates of the optimizer (e.g. of Adam) in bf16, which
+        roughly halves the size of the training checkpoint, by default False. They
+        are cast back to the dtype of the parameters when loaded.
+    sharded : bool, optional
+        Split the optimizer state across the ranks of a data parallel run, by
+        default False. Every rank then needs to call ``save_checkpoint``: each one
+        writes the states of a subset of the parameters to
+        "{checkpoint}.shard{rank}of{world size}" in parallel, and rank 0 writes the
+        models and the rest of the training checkpoint. ``load_checkpoint`` reads
+        all shards, so the checkpoint can be loaded with any number of ranks. Ranks
+        are synchronized after the shards are written, unless ``async_save`` is set.
+    reuse_pinned_buffers : bool, optional
+        Keep the pinned host buffers the device tensors are staged in, and reuse them
+        for the next saves of the same models and optimizer, by default False. They
+        are then released along with these objects, instead of after every save. This
+        is always the case for asynchronous saves. Only used with
+        ``use_pinned_memory``.
     """
+    # Previous writes must be done for the next checkpoint index to be valid
+    _wait_for_pending_saves()
+
     protocol = fsspec.utils.get_protocol(path)
     fs = fsspec.filesystem(protocol)
     # Create checkpoint directory if it does not exist.
@@ -240,32 +687,60 @@ def save_checkpoint(
         )
         Path(path).mkdir(parents=True, exist_ok=True)
 
+    shard_rank, num_shards = _optimizer_shards(sharded and optimizer is not None)
+
     # == Saving model checkpoint ==
-    if models:
+    if models and shard_rank == 0:
         if not isinstance(models, list):
             models = [models]
-        models = _unique_model_names(models)
-        for name, model in models.items():
-            # Get model type
-            model_type = (
-                "mdlus" if isinstance(model, physicsnemo.models.Module) else "pt"
-            )
-
-            # Get full file path / name
-            file_name = _get_checkpoint_filename(
-                path, name, index=epoch, saving=True, model_type=model_type
+        # Reuse the model names if the same models are saved again
+        plan = _save_plans.get(path)
+        if (
+            plan is not None
+            and len(plan[0]) == len(models)
+            and all(ref() is model for ref, model in zip(plan[0], models))
+        ):
+            # The unwrapped models are kept alive by the saved ones
+            models = {name: ref() for name, ref in plan[1].items()}
+        else:
+            model_refs = tuple(weakref.ref(model) for model in models)
+            models = _unique_model_names(models)
+            _save_plans[path] = (
+                model_refs,
+                {name: weakref.ref(model) for name, model in models.items()},
             )
-
-            # Save state dictionary
-            if isinstance(model, physicsnemo.models.Module):
-                model.save(file_name)
-            else:
-                with fs.open(file_name, "wb") as fp:
-                    torch.save(model.state_dict(), fp)
-            checkpoint_logging.success(f"Saved model state dictionary: {file_name}")
+        save_kwargs = {
+            "path": path,
+            "epoch": epoch,
+            "fs": fs,
+            "async_save": async_save,
+            "compute_crc32": compute_crc32,
+            "use_pinned_memory": use_pinned_memory,
+            "incremental": incremental,
+            "reuse_pinned_buffers": reuse_pinned_buffers,
+        }
+        if len(models) == 1:
+            for name, model in models.items():
+                _save_model(name, model, **save_kwargs)
+        else:
+            # Needs to be initialized before the threads name the files
+            _initialize_distributed_manager()
+            # Serialization and writes mostly release the GIL
+            with ThreadPoolExecutor(max_workers=min(8, len(models))) as executor:
+                futures = [
+                    executor.submit(_save_model, name, model, **save_kwargs)
+                    for name, model in models.items()
+                ]
+                for future in futures:
+                    future.result()
 
     # == Saving training checkpoint ==
+    # Model only saves do not need a training checkpoint
+    if not (optimizer or scheduler or scaler or epoch or metadata):
+        return
+
     checkpoint_dict = {}
+    optimizer_shard = {}
     # Optimizer state dict
     if optimizer:
         opt_state_dict = optimizer.state_dict()
@@ -274,7 +749,22 @@ def save_checkpoint(
             param_names = pg.get("param_names")
             if param_names is None:
                 continue
-            pg["param_names"] = [pn.removeprefix("_orig_mod.") for pn in param_names]
+            # Only rebuild the names of compiled models
+            if any(pn.startswith("_orig_mod.") for pn in param_names):
+                pg["param_names"] = [
+                    pn.removeprefix("_orig_mod.") for pn in param_names
+                ]
+        if quantize_optimizer:
+            opt_state_dict = _quantize_optimizer_state(opt_state_dict)
+        if num_shards > 1:
+            # Each rank saves the states of every num_shards-th parameter
+            optimizer_shard = {
+                param_id: param_state
+                for param_id, param_state in opt_state_dict["state"].items()
+                if param_id % num_shards == shard_rank
+            }
+            opt_state_dict = {**opt_state_dict, "state": {}}
+            checkpoint_dict["optimizer_shards"] = num_shards
         checkpoint_dict["optimizer_state_dict"] = opt_state_dict
 
     # Scheduler state dict
@@ -298,13 +788,195 @@ def save_checkpoint(
         checkpoint_dict["metadata"] = metadata
 
     # Save checkpoint to memory
-    if bool(checkpoint_dict):
-        with fs.open(output_filename, "wb") as fp:
-            torch.save(
-                checkpoint_dict,
-                fp,
-            )
-        checkpoint_logging.success(f"Saved training checkpoint: {output_filename}")
+    # The training checkpoint is mostly made of the optimizer state
+    buffers = _staging_buffers(
+        optimizer, use_pinned_memory, async_save or reuse_pinned_buffers
+    )
+    write_kwargs = {
+        "fs": fs,
+        "async_save": async_save,
+        "compute_crc32": compute_crc32,
+        "use_pinned_memory": use_pinned_memory,
+    }
+    if num_shards > 1:
+        # All ranks write their shard next to the checkpoint named by rank 0
+        object_list = [output_filename]
+        torch.distributed.broadcast_object_list(object_list, src=0)
+        output_filename = object_list[0]
+        _write_state(
+            {"state": optimizer_shard},
+            f"{output_filename}.shard{shard_rank}of{num_shards}",
+            buffers=None if buffers is None else buffers.setdefault("shard", {}),
+            description="optimizer state shard",
+            **write_kwargs,
+        )
+    if bool(checkpoint_dict) and shard_rank == 0:
+        _write_state(
+            checkpoint_dict,
+            output_filename,
+            buffers=None if buffers is None else buffers.setdefault("checkpoint", {}),
+            description="training checkpoint",
+            **write_kwargs,
+        )
+        _save_metadata(output_filename, fs, epoch, metadata)
+    if num_shards > 1 and not async_save:
+        torch.distributed.barrier()
+
+
+def _write_state(
+    obj: Any,
+    file_name: str,
+    fs: fsspec.AbstractFileSystem,
+    buffers: Optional[Dict[Tuple, torch.Tensor]],
+    async_save: bool,
+    compute_crc32: bool,
+    use_pinned_memory: bool,
+    description: str,
+) -> None:
+    """Stages a state dictionary in host memory and saves it
+
+    See ``save_checkpoint`` for a description of the parameters. ``buffers`` holds
+    the pinned staging buffers, if any, and ``description`` is used for logging.
+    """
+    obj = _copy_to_cpu(obj, buffers, clone=async_save)
+    options = _save_options(compute_crc32, use_pinned_memory)
+    if async_save:
+        _save_state_async(obj, file_name, fs, options, description)
+    else:
+        _save_bytes(obj, file_name, fs, options)
+        checkpoint_logging.success(f"Saved {description}: {file_name}")
+
+
+def _optimizer_shards(sharded: bool) -> Tuple[int, int]:
+    """Gets the shard index of this rank and the number of optimizer state shards
+
+    Optimizer states are only sharded across the ranks of data parallel runs; with
+    model parallelism each model parallel rank already saves its own checkpoint.
+
+    Parameters
+    ----------
+    sharded : bool
+        Whether sharding was requested
+
+    Returns
+    -------
+    Tuple[int, int]
+        Shard index and number of shards, (0, 1) if the state is not sharded
+    """
+    if not sharded:
+        return 0, 1
+    _initialize_distributed_manager()
+    manager = DistributedManager()
+    if not manager.distributed or manager.world_size == 1:
+        return 0, 1
+    if "model_parallel" in manager.group_names:
+        checkpoint_logging.warning(
+            "Sharded optimizer states are not supported with model parallelism, "
+            "saving them unsharded"
+        )
+        return 0, 1
+    return manager.rank, manager.world_size
+
+
+def _quantize_optimizer_state(
+    state_dict: Dict[str, Any], dtype: torch.dtype = torch.bfloat16
+) -> Dict[str, Any]:
+    """Casts the fp32 moment estimates of an optimizer state dictionary
+
+    The per-parameter states are copied, the state of the optimizer itself is not
+    modified. ``optimizer.load_state_dict`` casts floating point states back to the
+    dtype of their parameter.
+
+    Parameters
+    ----------
+    state_dict : Dict[str, Any]
+        Optimizer state dictionary
+    dtype : torch.dtype, optional
+        Target dtype, by default torch.bfloat16
+
+    Returns
+    -------
+    Dict[str, Any]
+        Optimizer state dictionary with cast moment estimates
+    """
+    moment_keys = ("exp_avg", "exp_avg_sq", "max_exp_avg_sq")
+    state = {}
+    for param_id, param_state in state_dict.get("state", {}).items():
+        param_state = dict(param_state)
+        for key in moment_keys:
+            value = param_state.get(key)
+            if isinstance(value, torch.Tensor) and value.dtype == torch.float32:
+                param_state[key] = value.to(dtype)
+        state[param_id] = param_state
+    return {**state_dict, "state": state}
+
+
+def _save_metadata(
+    file_name: str,
+    fs: fsspec.AbstractFileSystem,
+    epoch: Union[int, None],
+    metadata: Optional[Dict[str, Any]],
+) -> None:
+    """Writes the epoch and metadata of a training checkpoint to a JSON sidecar file"""
+    try:
+        content = json.dumps({"epoch": epoch or 0, "metadata": metadata or {}})
+    except TypeError:
+        checkpoint_logging.warning(
+            f"Metadata of {file_name} is not JSON serializable, skipping metadata file"
+        )
+        # Do not leave the metadata of an overwritten checkpoint behind
+        try:
+            fs.rm(file_name + ".json")
+        except FileNotFoundError:
+            pass
+        return
+    with fs.open(file_name + ".json", "w") as fp:
+        fp.write(content)
+
+
+def load_checkpoint_metadata(
+    path: str,
+    epoch: Union[int, None] = None,
+) -> Tuple[int, Dict[str, Any]]:
+    """Training checkpoint metadata loading utility
+
+    Reads the epoch and metadata of a training checkpoint saved with
+    ``save_checkpoint`` from its JSON metadata file, without loading the checkpoint
+    itself. Falls back to loading the training checkpoint if it has no metadata
+    file, for example for checkpoints saved by earlier versions.
+
+    Parameters
+    ----------
+    path : str
+        Path to training checkpoint
+    epoch : Union[int, None], optional
+        Epoch checkpoint to read. If none is provided this will read the checkpoint
+        with the largest index, by default None
+
+    Returns
+    -------
+    Tuple[int, Dict[str, Any]]
+        Saved epoch and metadata, in their JSON representation
+    """
+    _wait_for_pending_saves()
+
+    fs = fsspec.filesystem(fsspec.utils.get_protocol(path))
+    checkpoint_filename = _get_checkpoint_filename(path, index=epoch, model_type="pt")
+    try:
+        with fs.open(checkpoint_filename + ".json", "r") as fp:
+            content = json.load(fp)
+        return content["epoch"], content["metadata"]
+    except FileNotFoundError:
+        pass
+
+    try:
+        checkpoint_dict = _load_state(checkpoint_filename, "cpu", weights_only=False)
+    except FileNotFoundError:
+        checkpoint_logging.warning(
+            "Could not find valid checkpoint file, skipping load"
+        )
+        return 0, {}
+    return checkpoint_dict.get("epoch", 0), checkpoint_dict.get("metadata", {})
 
 
 def load_checkpoint(
@@ -348,20 +1020,24 @@ def load_checkpoint(
     int
         Loaded epoch
     """
+    _wait_for_pending_saves()
+
     fs = fsspec.filesystem(fsspec.utils.get_protocol(path))
-    # Check if checkpoint directory exists
-    if fs.exists(path):
-        if fs.isfile(path):
-            raise FileNotFoundError(
-                f"Provided checkpoint directory {path} is a file, not directory"
-            )
-    else:
+    # Check if checkpoint directory exists, with a single metadata request
+    try:
+        path_info = fs.info(path)
+    except FileNotFoundError:
         checkpoint_logging.warning(
             f"Provided checkpoint directory {path} does not exist, skipping load"
         )
         return 0
+    if path_info["type"] == "file":
+        raise FileNotFoundError(
+            f"Provided checkpoint directory {path} is a file, not directory"
+        )
 
     # == Loading model checkpoint ==
+    model_files = {}
     if models:
         if not isinstance(models, list):
             models = [models]
@@ -373,41 +1049,73 @@ def load_checkpoint(
             )
 
             # Get full file path / name
-            file_name = _get_checkpoint_filename(
+            model_files[name] = _get_checkpoint_filename(
                 path, name, index=epoch, model_type=model_type
             )
-            if not fs.exists(file_name):
-                checkpoint_logging.error(
-                    f"Could not find valid model file {file_name}, skipping load"
-                )
-                continue
-            # Load state dictionary
+
+    checkpoint_filename = _get_checkpoint_filename(path, index=epoch, model_type="pt")
+
+    # Missing files are detected when opening them, instead of probing for each of
+    # them first, which costs a round trip on object stores
+    # Download the files from object stores concurrently
+    if fsspec.utils.get_protocol(path) != "file":
+        remote_files = [
+            (file_name, isinstance(models[name], physicsnemo.models.Module))
+            for name, file_name in model_files.items()
+        ]
+        remote_files.append((checkpoint_filename, False))
+        if len(remote_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(remote_files))) as executor:
+                futures = [
+                    executor.submit(_prefetch_if_needed, file_name, is_module)
+                    for file_name, is_module in remote_files
+                ]
+                for future in futures:
+                    future.result()
+
+    for name, file_name in model_files.items():
+        model = models[name]
+        # Load state dictionary
+        try:
             if isinstance(model, physicsnemo.models.Module):
                 model.load(file_name)
             else:
-                file_to_load = _cache_if_needed(file_name)
-                model.load_state_dict(torch.load(file_to_load, map_location=device))
-            checkpoint_logging.success(
-                f"Loaded model state dictionary {file_name} to device {device}"
+                model.load_state_dict(_load_model_state(file_name, device))
+        except FileNotFoundError:
+            checkpoint_logging.error(
+                f"Could not find valid model file {file_name}, skipping load"
             )
+            continue
+        checkpoint_logging.success(
+            f"Loaded model state dictionary {file_name} to device {device}"
+        )
 
     # == Loading training checkpoint ==
-    checkpoint_filename = _get_checkpoint_filename(path, index=epoch, model_type="pt")
-    if not fs.exists(checkpoint_filename):
+    try:
+        # Training checkpoints may hold arbitrary metadata
+        checkpoint_dict = _load_state(checkpoint_filename, device, weights_only=False)
+    except FileNotFoundError:
         checkpoint_logging.warning(
             "Could not find valid checkpoint file, skipping load"
         )
         return 0
-
-    file_to_load = _cache_if_needed(checkpoint_filename)
-    checkpoint_dict = torch.load(file_to_load, map_location=device)
     checkpoint_logging.success(
         f"Loaded checkpoint file {checkpoint_filename} to device {device}"
     )
 
     # Optimizer state dict
     if optimizer and "optimizer_state_dict" in checkpoint_dict:
-        optimizer.load_state_dict(checkpoint_dict["optimizer_state_dict"])
+        opt_state_dict = checkpoint_dict["optimizer_state_dict"]
+        num_shards = checkpoint_dict.get("optimizer_shards", 1)
+        if num_shards > 1:
+            for shard_rank in range(num_shards):
+                opt_state_dict["state"].update(
+                    _load_state(
+                        f"{checkpoint_filename}.shard{shard_rank}of{num_shards}",
+                        device,
+                    )["state"]
+                )
+        optimizer.load_state_dict(opt_state_dict)
         checkpoint_logging.success("Loaded optimizer state dictionary")
 
     # Scheduler state dict
@@ -461,14 +1169,146 @@ def get_checkpoint_dir(base_dir: str, model_name: str) -> str:
         return os.path.join(base_dir, top_level_dir)
 
 
-# Read via cache and return the cached path for non-file protocols, otherwise just return the path
 def _cache_if_needed(path: str) -> str:
+    """Returns a local path of a checkpoint file
+
+    Files on other filesystems than the local one are downloaded to a cache shared by
+    the processes of a node, so that ranks on the same node download each file once.
+    Downloads are serialized with a file lock, and a cached copy is reused as long as
+    the size and modification stamps of the remote file are unchanged.
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint file
+
+    Returns
+    -------
+    str
+        Path of the file, or of its cached copy for non-file protocols
+    """
     protocol = fsspec.utils.get_protocol(path)
     if protocol == "file":
         return path
-    else:
-        return _download_cached(
-            path,
-            recursive=False,
-            local_cache_path=os.path.join(LOCAL_CACHE, f"checkpoint_pid_{os.getpid()}"),
+
+    local_cache_path = os.path.join(
+        LOCAL_CACHE, f"checkpoint_node_{socket.gethostname()}"
+    )
+    os.makedirs(local_cache_path, exist_ok=True)
+    cache_path = os.path.join(
+        local_cache_path, hashlib.sha256(path.encode()).hexdigest()
+    )
+
+    # Identifies the version of the remote file, a checkpoint can be overwritten
+    info = fsspec.filesystem(protocol).info(path)
+    version = json.dumps(
+        {key: str(info[key]) for key in _VERSION_KEYS if key in info}, sort_keys=True
+    )
+
+    with open(cache_path + ".lock", "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(cache_path + ".version", "r") as fp:
+                is_cached = fp.read() == version and os.path.isfile(cache_path)
+        except FileNotFoundError:
+            is_cached = False
+        if not is_cached:
+            fsspec.filesystem(protocol).get(path, cache_path + ".tmp")
+            os.replace(cache_path + ".tmp", cache_path)
+            with open(cache_path + ".version", "w") as fp:
+                fp.write(version)
+    return cache_path
+
+
+def _load_state(
+    path: str, device: Union[str, torch.device], weights_only: bool = True
+) -> Any:
+    """Loads an object saved with torch.save from a checkpoint file
+
+    The file is memory mapped instead of being read in full before the tensors are
+    copied out of it. Remote files are loaded from their local cached copy, which is
+    never rewritten, and local checkpoints are replaced rather than rewritten in
+    place when saved again, so the mapped files do not change while being read.
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint file
+    device : Union[str, torch.device]
+        Target device
+    weights_only : bool, optional
+        Restrict unpickling to tensors and primitive types, by default True
+
+    Returns
+    -------
+    Any
+        Loaded object
+    """
+    return torch.load(
+        _cache_if_needed(path),
+        map_location=device,
+        mmap=True,
+        weights_only=weights_only,
+    )
+
+
+def _file_sha256(path: str) -> Tuple[int, str]:
+    """Computes the size and SHA-256 digest of a checkpoint file, or of its cached copy"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(_cache_if_needed(path), "rb") as fp:
+        while chunk := fp.read(_UPLOAD_BLOCK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def _load_model_state(path: str, device: Union[str, torch.device]) -> Dict[str, Any]:
+    """Loads a model state dictionary, merging incremental saves onto their snapshot
+
+    Raises a ``ValueError`` if the snapshot of an incremental save is missing, or if it
+    was overwritten since the incremental save.
+    """
+    state_dict = _load_state(path, device)
+    if _INCREMENTAL_BASE_KEY not in state_dict:
+        return state_dict
+
+    base_path = f"{path.rsplit('/', 1)[0]}/{state_dict[_INCREMENTAL_BASE_KEY]}"
+    try:
+        base_size, base_sha256 = _file_sha256(base_path)
+    except FileNotFoundError as err:
+        raise ValueError(
+            f"Snapshot {base_path} of incremental checkpoint {path} does not exist"
+        ) from err
+    if base_size != state_dict["base_size"] or base_sha256 != state_dict["base_sha256"]:
+        raise ValueError(
+            f"Snapshot {base_path} of incremental checkpoint {path} was overwritten "
+            "since it was saved"
         )
+    base_state_dict = _load_state(base_path, device)
+    changed = state_dict["state_dict"]
+    # Entries removed since the snapshot are not restored
+    merged = OrderedDict(
+        (key, changed[key] if key in changed else base_state_dict[key])
+        for key in state_dict["keys"]
+    )
+    if hasattr(base_state_dict, "_metadata"):
+        merged._metadata = base_state_dict._metadata
+    return merged
+
+
+def _prefetch_if_needed(path: str, is_module: bool) -> None:
+    """Downloads a remote checkpoint file to the cache it is loaded from
+
+    PhysicsNeMo models read from the default cache of ``Module.load``, other files
+    from the checkpoint cache of ``_cache_if_needed``. Missing files are skipped and
+    reported when they are loaded.
+    """
+    try:
+        if is_module:
+            _download_cached(path)
+        else:
+            _cache_if_needed(path)
+    except FileNotFoundError:
+        pass
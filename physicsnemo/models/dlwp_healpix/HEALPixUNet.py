@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import logging
 from dataclasses import dataclass
 from typing import Sequence
@@ -22,7 +23,17 @@ import torch as th
 from hydra.utils import instantiate
 from omegaconf import DictConfig
 
-from physicsnemo.models.dlwp_healpix_layers import HEALPixFoldFaces, HEALPixUnfoldFaces
+try:
+    from transformer_engine import pytorch as te
+    from transformer_engine.common.recipe import DelayedScaling
+except ImportError:
+    te = None
+
+from physicsnemo.models.dlwp_healpix_layers import (
+    ConvGRUBlock,
+    HEALPixFoldFaces,
+    HEALPixUnfoldFaces,
+)
 from physicsnemo.models.meta import ModelMetaData
 from physicsnemo.models.module import Module
 
@@ -39,6 +50,8 @@ class MetaData(ModelMetaData):
     cuda_graphs: bool = True
     amp_cpu: bool = True
     amp_gpu: bool = True
+    # FP8 for Transformer Engine layers in the encoder/decoder, off by default
+    fp8_gpu: bool = False
     # Inference
     onnx: bool = False
     # Physics informed
@@ -50,6 +63,9 @@ class MetaData(ModelMetaData):
 class HEALPixUNet(Module):
     """Deep Learning Weather Prediction (DLWP) UNet on the HEALPix mesh."""
 
+    # Maximum number of entries of the per-shape cache, the oldest ones are dropped first
+    max_cached_shapes: int = 16
+
     def __init__(
         self,
         encoder: DictConfig,
@@ -64,6 +80,9 @@ class HEALPixUNet(Module):
         enable_nhwc: bool = False,
         enable_healpixpad: bool = False,
         couplings: list = [],
+        amp_mode: bool = False,
+        enable_compile: bool = False,
+        enable_cuda_graphs: bool = False,
     ):
         """
         Parameters
@@ -95,8 +114,18 @@ class HEALPixUNet(Module):
             Enable CUDA HEALPixPadding if installed. default: False
         couplings: list, optional
             sequence of dictionaries that describe coupling mechanisms
+        amp_mode: bool, optional
+            Run the encoder and decoder in bfloat16 autocast, on the devices enabled by the
+            `amp_cpu` and `amp_gpu` model metadata. default: False
+        enable_compile: bool, optional
+            Compile the encoder and decoder with torch.compile for static input shapes. default: False
+        enable_cuda_graphs: bool, optional
+            Replay the encoder and decoder pass of CUDA inference rollouts from CUDA graphs. Not
+            supported with recurrent blocks in the encoder or decoder. default: False
         """
-        super().__init__()
+        # Checkpoints are named after the model name, which was the default one before
+        # the metadata was used, keep it so that existing checkpoints are found
+        super().__init__(meta=MetaData(name=ModelMetaData.name))
 
         if len(couplings) > 0:
             if n_constants == 0:
@@ -121,6 +150,13 @@ class HEALPixUNet(Module):
         self.channel_dim = 2  # Now 2 with [B, F, C*T, H, W]. Was 1 in old data format with [B, T*C, F, H, W]
         self.enable_nhwc = enable_nhwc
         self.enable_healpixpad = enable_healpixpad
+        self.amp_mode = amp_mode
+        self.enable_compile = enable_compile
+        self.enable_cuda_graphs = enable_cuda_graphs
+        # Per-shape state reused across integration steps and calls for inference: encoder input
+        # buffers, pinned staging buffers and captured CUDA graphs. Repeated calls with the same
+        # shapes skip all allocations and captures.
+        self._shape_cache = {}
 
         # Number of passes through the model, or a diagnostic model with only one output time
         self.is_diagnostic = self.output_time_dim == 1 and self.input_time_dim > 1
@@ -129,28 +165,80 @@ class HEALPixUNet(Module):
                 f"'output_time_dim' must be a multiple of 'input_time_dim' (got "
                 f"{self.output_time_dim} and {self.input_time_dim})"
             )
+        # Number of time steps predicted by each pass through the model
+        self._output_step_time_dim = 1 if self.is_diagnostic else self.input_time_dim
+        # All of these only depend on the arguments above, compute them once
+        self._integration_steps = max(self.output_time_dim // self.input_time_dim, 1)
+        self._input_channels_total = self._compute_input_channels()
+        self._output_channels_total = self._compute_output_channels()
+        # The inputs passed to forward are fixed by the arguments above, select their reshape once
+        if len(self.couplings) > 0:
+            self._reshape_inputs = self._reshape_coupled_inputs
+        elif self.n_constants == 0 and self.decoder_input_channels == 0:
+            self._reshape_inputs = self._reshape_prognostic_inputs
+        elif self.n_constants == 0:
+            self._reshape_inputs = self._reshape_decoder_inputs
+        elif self.decoder_input_channels == 0:
+            self._reshape_inputs = self._reshape_constant_inputs
+        else:
+            self._reshape_inputs = self._reshape_all_inputs
 
         # Build the model layers
-        self.fold = HEALPixFoldFaces()
-        self.unfold = HEALPixUnfoldFaces(num_faces=12)
+        self.fold = HEALPixFoldFaces(enable_nhwc=self.enable_nhwc)
+        self.unfold = HEALPixUnfoldFaces(num_faces=12, enable_nhwc=self.enable_nhwc)
         self.encoder = instantiate(
             config=encoder,
-            input_channels=self._compute_input_channels(),
+            input_channels=self._input_channels_total,
             enable_nhwc=self.enable_nhwc,
             enable_healpixpad=self.enable_healpixpad,
         )
         self.encoder_depth = len(self.encoder.n_channels)
         self.decoder = instantiate(
             config=decoder,
-            output_channels=self._compute_output_channels(),
+            output_channels=self._output_channels_total,
             enable_nhwc=self.enable_nhwc,
             enable_healpixpad=self.enable_healpixpad,
         )
+        if self.enable_cuda_graphs and any(
+            isinstance(m, ConvGRUBlock) for m in self.modules()
+        ):
+            # The warmup and capture would advance the hidden states, and the replays
+            # would not update them
+            raise ValueError(
+                "'enable_cuda_graphs' is not supported with recurrent blocks in the "
+                "encoder or decoder"
+            )
+        if self.enable_nhwc:
+            # Keep every weight, not only the HEALPix convolutions, channels-last so
+            # cuDNN does not transpose activations between layers
+            self.encoder = self.encoder.to(memory_format=th.channels_last)
+            self.decoder = self.decoder.to(memory_format=th.channels_last)
+        if self.enable_compile:
+            # Compile in place, which keeps the state dict keys of the submodules
+            self.encoder.compile(dynamic=False)
+            self.decoder.compile(dynamic=False)
+
+    def _apply(self, fn, *args, **kwargs):
+        # Moving or casting the model invalidates the addresses baked into
+        # captured graphs
+        self._shape_cache.clear()
+        return super()._apply(fn, *args, **kwargs)
+
+    def _cache_store(self, key, entry: dict):
+        """Adds an entry to the per-shape cache, dropping the oldest entries beyond
+        `max_cached_shapes`"""
+        self._shape_cache[key] = entry
+        while len(self._shape_cache) > self.max_cached_shapes:
+            oldest = next(iter(self._shape_cache))
+            if "copied" in self._shape_cache[oldest]:
+                # A pending copy may still read the pinned buffer
+                self._shape_cache[oldest]["copied"].synchronize()
+            del self._shape_cache[oldest]
 
     @property
     def integration_steps(self):
         """Number of integration steps"""
-        return max(self.output_time_dim // self.input_time_dim, 1)
+        return self._integration_steps
 
     def _compute_input_channels(self) -> int:
         """Calculate total number of input channels in the model"""
@@ -170,107 +258,217 @@ class HEALPixUNet(Module):
 
     def _compute_output_channels(self) -> int:
         """Compute the total number of output channels in the model"""
-        return (1 if self.is_diagnostic else self.input_time_dim) * self.output_channels
+        return self._output_step_time_dim * self.output_channels
+
+    def _concat(self, tensors: Sequence, static: Sequence = ()) -> th.Tensor:
+        """
+        Concatenates [B, F, C, H, W] tensors along the channel dimension. Copies them into a buffer
+        that is reused across integration steps when gradients are disabled, and lays it out so that
+        folding the faces is a view in both NCHW and NHWC formats.
+
+        Parameters
+        ----------
+        tensors: Sequence
+            tensors to concatenate, the first one of shape [B, F, C, H, W]. The others are broadcast
+            to its batch size, so constants can be passed as [F, C, H, W]
+        static: Sequence, optional
+            indices of time-invariant tensors, only copied into a reused buffer when they change.
+            default: ()
+
+        Returns
+        -------
+        torch.Tensor: concatenated tensor
+        """
+        B, F, _, H, W = tensors[0].shape
+        channels = self._input_channels_total
+        dtype = tensors[0].dtype
+        for t in tensors[1:]:
+            dtype = th.promote_types(dtype, t.dtype)
+
+        # A buffer reused while recording gradients would overwrite saved activations. Buffers
+        # created in inference mode cannot be updated outside of it, so they are kept apart
+        reuse = not th.is_grad_enabled()
+        key = (
+            "inputs",
+            B,
+            F,
+            channels,
+            H,
+            W,
+            dtype,
+            tensors[0].device,
+            th.is_inference_mode_enabled(),
+        )
+        entry = self._shape_cache.get(key) if reuse else None
+        if entry is None:
+            if self.enable_nhwc:
+                res = th.empty(
+                    B, F, H, W, channels, dtype=dtype, device=tensors[0].device
+                ).permute(0, 1, 4, 2, 3)
+            else:
+                res = th.empty(
+                    B, F, channels, H, W, dtype=dtype, device=tensors[0].device
+                )
+            entry = {"buffer": res, "static": {}}
+            if reuse:
+                self._cache_store(key, entry)
+        res = entry["buffer"]
+
+        start = 0
+        for i, t in enumerate(tensors):
+            end = start + t.shape[-3]
+            if i in static and not t.is_inference():
+                # Skip constants already in the buffer, unless modified in place since. Inference
+                # tensors have no version counter and are always copied
+                cached, version = entry["static"].get(start, (None, None))
+                if cached is not t or version != t._version:
+                    res[:, :, start:end].copy_(t)
+                    entry["static"][start] = (t, t._version)
+            else:
+                res[:, :, start:end].copy_(t)
+            start = end
+
+        return res
 
-    def _reshape_inputs(self, inputs: Sequence, step: int = 0) -> th.Tensor:
+    def _reshape_coupled_inputs(self, inputs: Sequence, step: int = 0) -> th.Tensor:
         """
         Returns a single tensor to pass into the model encoder/decoder. Squashes the time/channel dimension and
-        concatenates in constants and decoder inputs.
+        concatenates in constants, decoder inputs and coupled inputs.
 
         Parameters
         ----------
         inputs: Sequence
-            list of expected input tensors (inputs, decoder_inputs, constants)
+            list of expected input tensors (inputs, decoder_inputs, constants, coupled_inputs)
         step: int, optional
-            step number in the sequence of integration_stepsi. default: 0
+            step number in the sequence of integration_steps. default: 0
 
         Returns
         -------
         torch.Tensor: reshaped Tensor in expected shape for model encoder
         """
+        result = [
+            inputs[0].flatten(
+                start_dim=self.channel_dim, end_dim=self.channel_dim + 1
+            ),  # inputs
+            inputs[1]
+            .narrow(self.channel_dim, step * self.input_time_dim, self.input_time_dim)
+            .flatten(self.channel_dim, self.channel_dim + 1),  # DI
+            inputs[2],  # constants
+            inputs[3].permute(0, 2, 1, 3, 4),  # coupled inputs
+        ]
+        res = self._concat(result, static=(2,))
 
-        if len(self.couplings) > 0:
-            result = [
-                inputs[0].flatten(
-                    start_dim=self.channel_dim, end_dim=self.channel_dim + 1
-                ),
-                inputs[1][
-                    :,
-                    :,
-                    slice(step * self.input_time_dim, (step + 1) * self.input_time_dim),
-                    ...,
-                ].flatten(
-                    start_dim=self.channel_dim, end_dim=self.channel_dim + 1
-                ),  # DI
-                inputs[2].expand(
-                    *tuple([inputs[0].shape[0]] + len(inputs[2].shape) * [-1])
-                ),  # constants
-                inputs[3].permute(0, 2, 1, 3, 4),  # coupled inputs
-            ]
-            res = th.cat(result, dim=self.channel_dim)
+        # fold faces into batch dim
+        return self.fold(res)
 
-        else:
-            if not (self.n_constants > 0 or self.decoder_input_channels > 0):
-                res = inputs[0].flatten(
-                    start_dim=self.channel_dim, end_dim=self.channel_dim + 1
-                )
-                return self.fold(res)
-            if self.n_constants == 0:
-                result = [
-                    inputs[0].flatten(
-                        start_dim=self.channel_dim, end_dim=self.channel_dim + 1
-                    ),  # inputs
-                    inputs[1][
-                        :,
-                        :,
-                        slice(
-                            step * self.input_time_dim, (step + 1) * self.input_time_dim
-                        ),
-                        ...,
-                    ].flatten(self.channel_dim, self.channel_dim + 1),  # DI
-                ]
-                res = th.cat(result, dim=self.channel_dim)
-
-                # fold faces into batch dim
-                res = self.fold(res)
-
-                return res
-            if self.decoder_input_channels == 0:
-                result = [
-                    inputs[0].flatten(
-                        start_dim=self.channel_dim, end_dim=self.channel_dim + 1
-                    ),  # inputs
-                    inputs[1].expand(
-                        *tuple([inputs[0].shape[0]] + len(inputs[1].shape) * [-1])
-                    ),  # constants
-                ]
-                res = th.cat(result, dim=self.channel_dim)
-
-                # fold faces into batch dim
-                res = self.fold(res)
-
-                return res
-
-            result = [
-                inputs[0].flatten(
-                    start_dim=self.channel_dim, end_dim=self.channel_dim + 1
-                ),  # inputs
-                inputs[1][
-                    :,
-                    :,
-                    slice(step * self.input_time_dim, (step + 1) * self.input_time_dim),
-                    ...,
-                ].flatten(self.channel_dim, self.channel_dim + 1),  # DI
-                inputs[2].expand(
-                    *tuple([inputs[0].shape[0]] + len(inputs[2].shape) * [-1])
-                ),  # constants
-            ]
-            res = th.cat(result, dim=self.channel_dim)
+    def _reshape_prognostic_inputs(self, inputs: Sequence, step: int = 0) -> th.Tensor:
+        """
+        Returns a single tensor to pass into the model encoder/decoder for models without constants and
+        decoder inputs. Squashes the time/channel dimension.
+
+        Parameters
+        ----------
+        inputs: Sequence
+            list of expected input tensors (inputs)
+        step: int, optional
+            step number in the sequence of integration_steps. default: 0
+
+        Returns
+        -------
+        torch.Tensor: reshaped Tensor in expected shape for model encoder
+        """
+        res = inputs[0].flatten(
+            start_dim=self.channel_dim, end_dim=self.channel_dim + 1
+        )
 
         # fold faces into batch dim
-        res = self.fold(res)
+        return self.fold(res)
 
-        return res
+    def _reshape_decoder_inputs(self, inputs: Sequence, step: int = 0) -> th.Tensor:
+        """
+        Returns a single tensor to pass into the model encoder/decoder. Squashes the time/channel dimension and
+        concatenates in decoder inputs.
+
+        Parameters
+        ----------
+        inputs: Sequence
+            list of expected input tensors (inputs, decoder_inputs)
+        step: int, optional
+            step number in the sequence of integration_steps. default: 0
+
+        Returns
+        -------
+        torch.Tensor: reshaped Tensor in expected shape for model encoder
+        """
+        result = [
+            inputs[0].flatten(
+                start_dim=self.channel_dim, end_dim=self.channel_dim + 1
+            ),  # inputs
+            inputs[1]
+            .narrow(self.channel_dim, step * self.input_time_dim, self.input_time_dim)
+            .flatten(self.channel_dim, self.channel_dim + 1),  # DI
+        ]
+        res = self._concat(result)
+
+        # fold faces into batch dim
+        return self.fold(res)
+
+    def _reshape_constant_inputs(self, inputs: Sequence, step: int = 0) -> th.Tensor:
+        """
+        Returns a single tensor to pass into the model encoder/decoder. Squashes the time/channel dimension and
+        concatenates in constants.
+
+        Parameters
+        ----------
+        inputs: Sequence
+            list of expected input tensors (inputs, constants)
+        step: int, optional
+            step number in the sequence of integration_steps. default: 0
+
+        Returns
+        -------
+        torch.Tensor: reshaped Tensor in expected shape for model encoder
+        """
+        result = [
+            inputs[0].flatten(
+                start_dim=self.channel_dim, end_dim=self.channel_dim + 1
+            ),  # inputs
+            inputs[1],  # constants
+        ]
+        res = self._concat(result, static=(1,))
+
+        # fold faces into batch dim
+        return self.fold(res)
+
+    def _reshape_all_inputs(self, inputs: Sequence, step: int = 0) -> th.Tensor:
+        """
+        Returns a single tensor to pass into the model encoder/decoder. Squashes the time/channel dimension and
+        concatenates in constants and decoder inputs.
+
+        Parameters
+        ----------
+        inputs: Sequence
+            list of expected input tensors (inputs, decoder_inputs, constants)
+        step: int, optional
+            step number in the sequence of integration_steps. default: 0
+
+        Returns
+        -------
+        torch.Tensor: reshaped Tensor in expected shape for model encoder
+        """
+        result = [
+            inputs[0].flatten(
+                start_dim=self.channel_dim, end_dim=self.channel_dim + 1
+            ),  # inputs
+            inputs[1]
+            .narrow(self.channel_dim, step * self.input_time_dim, self.input_time_dim)
+            .flatten(self.channel_dim, self.channel_dim + 1),  # DI
+            inputs[2],  # constants
+        ]
+        res = self._concat(result, static=(2,))
+
+        # fold faces into batch dim
+        return self.fold(res)
 
     def _reshape_outputs(self, outputs: th.Tensor) -> th.Tensor:
         """Returns a maultiple tensors to from the model decoder.
@@ -291,21 +489,145 @@ class HEALPixUNet(Module):
         # unfold:
         outputs = self.unfold(outputs)
 
-        # extract shape and reshape
-        shape = tuple(outputs.shape)
-        res = th.reshape(
-            outputs,
-            shape=(
-                shape[0],
-                shape[1],
-                1 if self.is_diagnostic else self.input_time_dim,
-                -1,
-                *shape[3:],
-            ),
-        )
+        # split time and channels, a view of the dense decoder outputs in NCHW and NHWC formats
+        B, F, _, H, W = outputs.shape
+        res = outputs.view(B, F, self._output_step_time_dim, self.output_channels, H, W)
 
         return res
 
+    def _stage_inputs(self, inputs: Sequence) -> Sequence:
+        """
+        Copies CPU inputs to the CUDA device of the model through pinned host buffers, so the
+        host-to-device copies run asynchronously while the rollout kernels are launched.
+
+        Parameters
+        ----------
+        inputs: Sequence
+            inputs to the model
+
+        Returns
+        -------
+        Sequence: inputs with every CPU tensor replaced by its copy on the model device
+        """
+        device = self.device
+        if device.type != "cuda":
+            return inputs
+
+        staged = list(inputs)
+        for i, tensor in enumerate(inputs):
+            if not isinstance(tensor, th.Tensor) or tensor.device.type != "cpu":
+                continue
+            if tensor.requires_grad:
+                staged[i] = tensor.to(device)
+                continue
+
+            key = (
+                "pinned",
+                i,
+                tuple(tensor.shape),
+                tensor.dtype,
+                th.is_inference_mode_enabled(),
+            )
+            entry = self._shape_cache.get(key)
+            if entry is None:
+                entry = {
+                    "buffer": th.empty(
+                        tensor.shape, dtype=tensor.dtype, pin_memory=True
+                    ),
+                    "copied": th.cuda.Event(),
+                }
+                self._cache_store(key, entry)
+            else:
+                # The copy issued by the previous call may still read the buffer
+                entry["copied"].synchronize()
+            entry["buffer"].copy_(tensor)
+            staged[i] = entry["buffer"].to(device, non_blocking=True)
+            entry["copied"].record()
+
+        return staged
+
+    def _use_cuda_graphs(self, input_tensor: th.Tensor) -> bool:
+        """Whether the encoder/decoder pass can be replayed from a CUDA graph"""
+        return (
+            self.enable_cuda_graphs
+            and self.meta.cuda_graphs
+            and not self.meta.fp8_gpu
+            and input_tensor.is_cuda
+            and not self.training
+            and not th.is_grad_enabled()
+            and not th.cuda.is_current_stream_capturing()
+        )
+
+    def _capture_cuda_graph(self, input_tensor: th.Tensor, warmup: int = 3):
+        """Captures the encoder/decoder pass into a CUDA graph
+
+        Parameters
+        ----------
+        input_tensor: th.Tensor
+            folded input tensor the graph is captured for
+        warmup: int, optional
+            number of eager iterations run on a side stream before the capture. default: 3
+
+        Returns
+        -------
+        Tuple[th.cuda.CUDAGraph, th.Tensor, th.Tensor]: the graph with its static input and output tensors
+        """
+        static_input = th.empty_like(input_tensor)
+        static_input.copy_(input_tensor)
+
+        stream = th.cuda.Stream(device=input_tensor.device)
+        stream.wait_stream(th.cuda.current_stream())
+        with th.cuda.stream(stream):
+            for _ in range(warmup):
+                self.decoder(self.encoder(static_input))
+        th.cuda.current_stream().wait_stream(stream)
+
+        graph = th.cuda.CUDAGraph()
+        with th.cuda.graph(graph):
+            static_output = self.decoder(self.encoder(static_input))
+
+        return graph, static_input, static_output
+
+    def _encode_decode(self, input_tensor: th.Tensor) -> th.Tensor:
+        """Runs the encoder and decoder on a folded input tensor, replaying a captured
+        CUDA graph for inference on the GPU.
+
+        Parameters
+        ----------
+        input_tensor: th.Tensor
+            folded input tensor, as returned by `_reshape_inputs`
+
+        Returns
+        -------
+        th.Tensor: decoder outputs
+        """
+        if not self._use_cuda_graphs(input_tensor):
+            return self.decoder(self.encoder(input_tensor))
+
+        key = (
+            "graph",
+            tuple(input_tensor.shape),
+            input_tensor.stride(),
+            input_tensor.dtype,
+            th.is_autocast_enabled(),
+            th.is_inference_mode_enabled(),
+        )
+        entry = self._shape_cache.get(key)
+        if entry is None:
+            graph, static_input, static_output = self._capture_cuda_graph(input_tensor)
+            entry = {
+                "graph": graph,
+                "static_input": static_input,
+                "static_output": static_output,
+            }
+            self._cache_store(key, entry)
+
+        entry["static_input"].copy_(input_tensor)
+        entry["graph"].replay()
+
+        # The static output is overwritten by the next replay
+        return entry["static_output"].clone()
+
     def forward(self, inputs: Sequence, output_only_last=False) -> th.Tensor:
         """
         Forward pass of the HEALPixUnet
@@ -322,34 +644,73 @@ class HEALPixUNet(Module):
         Returns
         -------
         th.Tensor: Predicted outputs
+
+        Note
+        ----
+        With `enable_cuda_graphs`, the encoder/decoder pass of
+        CUDA inputs is captured into a CUDA graph on the first call of each input shape
+        and replayed for every subsequent integration step. This only applies to
+        inference, i.e., in eval mode with gradients disabled. With `amp_mode`, these
+        passes run in bfloat16 autocast and their outputs are cast back to the input
+        dtype. With `fp8_gpu` enabled in the model metadata, they run in Transformer
+        Engine's FP8 autocast instead of being replayed from CUDA graphs. Only
+        Transformer Engine layers, e.g., `te.Linear`, that replaced layers of the
+        encoder/decoder compute in FP8. CPU inputs of a model on the GPU are copied
+        to the device through pinned host buffers, and the outputs stay on the GPU.
         """
-        outputs = []
-        for step in range(self.integration_steps):
-            if step == 0:
-                if len(self.couplings) > 0:
-                    input_tensor = self._reshape_inputs(
-                        list(inputs[0:3]) + [inputs[3][step]], step
-                    )
-                else:
-                    input_tensor = self._reshape_inputs(inputs, step)
-            else:
-                if len(self.couplings) > 0:
-                    input_tensor = self._reshape_inputs(
-                        [outputs[-1]] + list(inputs[1:3]) + [inputs[3][step]], step
-                    )
-                else:
-                    input_tensor = self._reshape_inputs(
-                        [outputs[-1]] + list(inputs[1:]), step
-                    )
-            encodings = self.encoder(input_tensor)
-            decodings = self.decoder(encodings)
+        inputs = self._stage_inputs(inputs)
 
-            reshaped = self._reshape_outputs(decodings)  # Absolute prediction
-            outputs.append(reshaped)
+        # Autocast only wraps the encoder/decoder, the reshapes keep the input precision
+        device_type = inputs[0].device.type
+        amp_enabled = self.amp_mode and (
+            self.meta.amp_gpu if inputs[0].is_cuda else self.meta.amp_cpu
+        )
+        fp8_enabled = self.meta.fp8_gpu and inputs[0].is_cuda
+        if fp8_enabled and te is None:
+            raise ValueError(
+                "FP8 inference requires transformer-engine to be installed."
+            )
+        fp8_recipe = DelayedScaling() if fp8_enabled else None
+
+        # Only the last prediction is kept, it is fed back as the next step's prognostics
+        prediction = None
+        res = None
+        # Only the prognostics and coupled inputs change between steps
+        step_inputs = list(inputs)
+        coupled = len(self.couplings) > 0
+        for step in range(self._integration_steps):
+            if step > 0:
+                step_inputs[0] = prediction
+            if coupled:
+                step_inputs[3] = inputs[3][step]
+            input_tensor = self._reshape_inputs(step_inputs, step)
+            fp8_context = (
+                te.fp8_autocast(enabled=True, fp8_recipe=fp8_recipe)
+                if fp8_enabled
+                else contextlib.nullcontext()
+            )
+            with (
+                th.autocast(
+                    device_type=device_type, dtype=th.bfloat16, enabled=amp_enabled
+                ),
+                fp8_context,
+            ):
+                decodings = self._encode_decode(input_tensor)
+            if decodings.dtype != input_tensor.dtype:
+                decodings = decodings.to(input_tensor.dtype)
+
+            prediction = self._reshape_outputs(decodings)  # Absolute prediction
+
+            if not output_only_last:
+                # write each step into its time slab instead of concatenating at the end
+                if res is None:
+                    B, F, T, C, H, W = prediction.shape
+                    res = prediction.new_empty(
+                        B, F, T * self._integration_steps, C, H, W
+                    )
+                res[:, :, step * T : (step + 1) * T].copy_(prediction)
 
         if output_only_last:
-            res = outputs[-1]
-        else:
-            res = th.cat(outputs, dim=self.channel_dim)
+            res = prediction
 
         return res
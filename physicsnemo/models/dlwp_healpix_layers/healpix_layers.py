@@ -82,6 +82,8 @@ class HEALPixFoldFaces(th.nn.Module):
 
         """
         N, F, C, H, W = tensor.shape
+        # A view for contiguous inputs, and for channels-last inputs laid out as
+        # [B, F, H, W, C]; the conversion below is then a no-op as well
         tensor = torch.reshape(tensor, shape=(N * F, C, H, W))
 
         if self.enable_nhwc:
@@ -123,7 +125,8 @@ class HEALPixUnfoldFaces(th.nn.Module):
 
         """
         NF, C, H, W = tensor.shape
-        tensor = torch.reshape(tensor, shape=(-1, self.num_faces, C, H, W))
+        # Splitting the batch dimension is always a view, whatever the memory format
+        tensor = tensor.view(-1, self.num_faces, C, H, W)
 
         return tensor
 
@@ -14,6 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
+import functools
 from typing import Callable, Literal, Optional
 
 import numpy as np
@@ -26,8 +28,10 @@ from physicsnemo.utils.patching import GridPatching2D
 # ruff: noqa: E731
 
 
-# NOTE: use two wrappers for apply, to avoid recompilation when input shape changes
-@torch.compile()
+# NOTE: use two wrappers for apply, to avoid recompilation when input shape
+# changes. The patching wrappers are only compiled if requested with
+# compile_patching=True, as these small graphs are usually faster in eager
+# mode than with the guard checks of the compiled functions.
 def _apply_wrapper_Cin_channels(patching, input, additional_input=None):
     """
     Apply the patching operation to the input tensor with :math:`C_{in}` channels.
@@ -35,45 +39,97 @@ def _apply_wrapper_Cin_channels(patching, input, additional_input=None):
     return patching.apply(input=input, additional_input=additional_input)
 
 
-@torch.compile()
-def _apply_wrapper_Cout_channels_no_grad(patching, input, additional_input=None):
+def _apply_wrapper_Cout_channels(patching, input, additional_input=None):
     """
     Apply the patching operation to an input tensor with :math:`C_{out}`
-    channels that does not require gradients.
+    channels, whether it requires gradients or not.
     """
     return patching.apply(input=input, additional_input=additional_input)
 
 
-@torch.compile()
-def _apply_wrapper_Cout_channels_grad(patching, input, additional_input=None):
+def _fuse_wrapper(patching, input, batch_size):
+    return patching.fuse(input=input, batch_size=batch_size)
+
+
+def _sampling_mode(differentiable: bool) -> contextlib.AbstractContextManager:
     """
-    Apply the patching operation to an input tensor with :math:`C_{out}`
-    channels that requires gradients.
+    Context manager to evaluate the network without recording gradients, unless
+    ``differentiable`` is True.
     """
-    return patching.apply(input=input, additional_input=additional_input)
+    return contextlib.nullcontext() if differentiable else torch.no_grad()
 
 
-@torch.compile()
-def _fuse_wrapper(patching, input, batch_size):
-    return patching.fuse(input=input, batch_size=batch_size)
+@functools.cache
+def _compiled(fn: Callable, fullgraph: bool = False) -> Callable:
+    """
+    Compile a patching wrapper or a solver step, only once for all calls to
+    the sampler.
+    """
+    return torch.compile(fn, fullgraph=fullgraph)
+
+
+def _maybe_compile(fn: Callable, enable: bool, fullgraph: bool = False) -> Callable:
+    """
+    Return the compiled version of the patching wrapper or solver step ``fn``
+    if ``enable`` is True, and ``fn`` itself otherwise.
+    """
+    return _compiled(fn, fullgraph) if enable else fn
+
+
+def _maybe_scale(x: torch.Tensor, s_x: torch.Tensor, scaling: str) -> torch.Tensor:
+    """
+    Return ``x / s_x``, or ``x`` itself when ``scaling="none"``, in which case
+    :math:`s(t)=1` and the division would only copy ``x``.
+    """
+    return x if scaling == "none" else x / s_x
+
+
+# NOTE: the solver arithmetic is memory-bound and operates on full-size
+# tensors. With compile_solver=True, each update is compiled into a single
+# kernel, and the scalar coefficients are passed as 0-d tensors to avoid
+# recompiling on their values. The outputs of the network are cast to the
+# sampling precision inside these updates.
+def _euler_step(x_hat, denoised, c_x, c_denoised, h):
+    r"""
+    Compute the slope :math:`d_i` at :math:`\hat{t}_i` and the Euler update
+    :math:`\hat{x}_i + h d_i`, where ``h`` is the (possibly scaled) step
+    size.
+    """
+    d_cur = c_x * x_hat - c_denoised * denoised.to(x_hat.dtype)
+    return d_cur, x_hat + h * d_cur
+
+
+def _heun_step(x_hat, x_prime, d_cur, denoised, c_x, c_denoised, h, w_cur, w_prime):
+    """
+    Compute the 2nd order correction of the Heun solver from the slope
+    ``d_cur`` of the Euler step and the slope evaluated at ``x_prime``.
+    """
+    d_prime = c_x * x_prime - c_denoised * denoised.to(x_hat.dtype)
+    return x_hat + h * (w_cur * d_cur + w_prime * d_prime)
+
+
+def _dpmpp_2m_step(x_hat, denoised, denoised_prev, c_x, c_denoised, w_cur, w_prev):
+    """
+    Compute the DPM-Solver++(2M) update from the denoised outputs of the
+    current and previous time steps.
+    """
+    dtype = x_hat.dtype
+    return c_x * x_hat + c_denoised * (
+        w_cur * denoised.to(dtype) + w_prev * denoised_prev.to(dtype)
+    )
 
 
 def _apply_wrapper_select(
-    input: torch.Tensor, patching: GridPatching2D | None
+    patching: GridPatching2D | None, compile: bool = False
 ) -> Callable:
     """
-    Select the correct patching wrapper based on the input tensor's requires_grad attribute.
+    Select the correct patching wrapper to apply to the input tensors.
     If patching is None, return the identity function.
-    If patching is not None, return the appropriate patching wrapper.
-    If input.requires_grad is True, return _apply_wrapper_Cout_channels_grad.
-    If input.requires_grad is False, return
-    _apply_wrapper_Cout_channels_no_grad.
+    If patching is not None, return _apply_wrapper_Cout_channels, compiled if
+    compile is True.
     """
     if patching:
-        if input.requires_grad:
-            return _apply_wrapper_Cout_channels_grad
-        else:
-            return _apply_wrapper_Cout_channels_no_grad
+        return _maybe_compile(_apply_wrapper_Cout_channels, compile)
     else:
         return lambda patching, input, additional_input=None: input
 
@@ -92,7 +148,7 @@ def deterministic_sampler(
     sigma_min: Optional[float] = None,
     sigma_max: Optional[float] = None,
     rho: float = 7.0,
-    solver: Literal["heun", "euler"] = "heun",
+    solver: Literal["heun", "euler", "dpmpp_2m"] = "heun",
     discretization: Literal["vp", "ve", "iddpm", "edm"] = "edm",
     schedule: Literal["vp", "ve", "linear"] = "linear",
     scaling: Literal["vp", "none"] = "none",
@@ -105,7 +161,14 @@ def deterministic_sampler(
     S_min: float = 0.0,
     S_max: float = float("inf"),
     S_noise: float = 1.0,
-    dtype: torch.dtype = torch.float64,
+    dtype: torch.dtype = torch.float32,
+    schedule_dtype: torch.dtype = torch.float64,
+    compile_patching: bool = False,
+    parareal_iters: int = 0,
+    differentiable: bool = True,
+    channels_last: bool = False,
+    net_compile_mode: Optional[str] = None,
+    compile_solver: bool = False,
 ) -> torch.Tensor:
     r"""
     Generalized sampler, representing the superset of all sampling methods
@@ -176,11 +239,16 @@ def deterministic_sampler(
         Only used when ``discretization="heun"``. Values in the range
         [5, 10] produce better images. Lower values lead to truncation errors
         equalized over all time steps. Defaults to 7.
-    solver : Literal["heun", "euler"]
+    solver : Literal["heun", "euler", "dpmpp_2m"]
         The numerical method used to integrate the stochastic ODE. ``"euler"``
         is 1st order solver, which is faster but produces lower-quality
         images. ``"heun"`` is 2nd order, more expensive, but produces
-        higher-quality images. Defaults to ``"heun"``.
+        higher-quality images. ``"dpmpp_2m"`` is the 2nd order multistep
+        DPM-Solver++(2M) of `Lu et al. <https://arxiv.org/abs/2211.01095>`_,
+        which only evaluates ``net`` once per time-step by reusing the
+        denoised output of the previous time-step. It usually reaches the
+        quality of ``"heun"`` with fewer evaluations of ``net``. Defaults to
+        ``"heun"``.
     discretization : Literal["vp", "ve", "iddpm", "edm"]
         The method to discretize time-steps :math:`t_i` in the
         diffusion process. See the EDM paper for details. Defaults to
@@ -210,8 +278,9 @@ def deterministic_sampler(
     alpha : float, optional
         Controls (i.e. multiplies) the step size :math:`t_{i+1} -
         \hat{t}_i` in the stochastic sampler, where :math:`\hat{t}_i` is
-        the temporarily increased noise level. Defaults to 1.0, which is
-        the recommended value.
+        the temporarily increased noise level. Ignored when
+        ``solver="dpmpp_2m"``. Defaults to 1.0, which is the recommended
+        value.
     S_churn : int, optional
         Controls the amount of stochasticty injected in the SDE in the
         stochatsic sampler. Larger values of ``S_churn`` lead to larger values
@@ -231,13 +300,88 @@ def deterministic_sampler(
         :math:`\epsilon_i` where :math:`\epsilon_i \sim \mathcal{N}(0, S_{noise}^2)`. Defaults
         to 1.0.
     dtype : torch.dtype, optional
-        Controls the precision used for sampling
+        Controls the precision used for sampling, that is for the latent state
+        updated at each time step and for the outputs of ``net``. Defaults to
+        ``torch.float32``.
+    schedule_dtype : torch.dtype, optional
+        Precision used to compute the time-step discretization and the noise
+        level schedule, which are then cast to ``dtype`` before sampling.
+        Defaults to ``torch.float64``.
+    compile_patching : bool, optional
+        Whether to compile the patching operations (extraction of the patches
+        and fusion of the denoised patches) with ``torch.compile``. Only used
+        when ``patching`` is provided. To speed-up the sampling, it is usually
+        more beneficial to compile the diffusion model ``net`` itself before
+        passing it to the sampler. Defaults to ``False``.
+    parareal_iters : int, optional
+        Number of Parareal iterations used to integrate the ODE in parallel
+        over the time-steps, as in Self-Refining Diffusion Samplers (SRDS,
+        Selvam et al.). If positive, the ``num_steps``
+        time-steps are grouped in about :math:`\sqrt{\text{num_steps}}`
+        blocks: a coarse trajectory is first computed with a single Euler step
+        per block, and each iteration then integrates all the blocks in
+        parallel with ``solver`` (in a single batch of
+        :math:`\sqrt{\text{num_steps}}` times the batch size, which must fit
+        in memory) before correcting the trajectory with the coarse
+        propagator. When the number of iterations reaches the number of blocks,
+        the result is the same as the sequential integration. ``net`` must
+        accept a different noise level for each sample of the batch. Only
+        supported for the ``"euler"`` and ``"heun"`` solvers, without
+        stochasticity (``S_churn=0``) and without ``patching``. Defaults to 0,
+        in which case the time-steps are integrated sequentially.
+    differentiable : bool, optional
+        Whether gradients can be backpropagated through the sampling process,
+        for example with respect to ``latents``, ``img_lr`` or the parameters
+        of ``net``. If ``False``, the network is evaluated under
+        ``torch.no_grad()``, which avoids storing the activations of every
+        evaluation of ``net``. The training mode of ``net`` is left unchanged.
+        Defaults to ``True``.
+    channels_last : bool, optional
+        Whether to convert ``latents``, ``img_lr`` and ``mean_hr`` to the
+        ``torch.channels_last`` memory format, so that the inputs of ``net``
+        and the generated samples are channels last. Convolutions are usually
+        faster with this memory format on GPUs, in particular when ``net`` is
+        also converted with ``net.to(memory_format=torch.channels_last)``
+        before sampling. Defaults to ``False``.
+    net_compile_mode : Optional[str], optional
+        If provided, the diffusion model is compiled in-place with
+        ``torch.compile`` and this ``mode`` (for example ``"default"``,
+        ``"reduce-overhead"`` or ``"max-autotune"``) before sampling. When
+        ``net`` wraps the network in a ``model`` attribute (such as the
+        preconditioners in :mod:`~physicsnemo.models.diffusion`), only
+        ``net.model`` is compiled. This is done once: ``net`` is flagged as
+        compiled and the compiled network is reused by subsequent calls. Note
+        that the first call can take several minutes, and that a new
+        compilation is triggered whenever the input shapes change. Defaults to
+        ``None``, in which case ``net`` is not compiled.
+    compile_solver : bool, optional
+        Whether to compile the solver updates (Euler, Heun and DPM-Solver++
+        steps) with ``torch.compile``, each into a single kernel. This reduces
+        the memory traffic of the updates for large inputs, at the cost of a
+        compilation on the first call. Defaults to ``False``.
     Returns
     -------
         torch.Tensor:
             Generated batch of samples. Same shape as the input ``latents``.
     """
 
+    if net_compile_mode is not None and not getattr(net, "_compiled", False):
+        # Compiled in-place, so that the attributes of net (sigma_min,
+        # round_sigma, ...) are still available to the sampler.
+        model = getattr(net, "model", None)
+        if not isinstance(model, torch.nn.Module):
+            model = net
+        model.compile(mode=net_compile_mode, dynamic=False)
+        net._compiled = True
+
+    if channels_last:
+        # The time-step updates are elementwise and preserve the memory format
+        # of latents, so the whole sampling state is channels last.
+        latents = latents.to(memory_format=torch.channels_last)
+        img_lr = img_lr.to(memory_format=torch.channels_last)
+        if mean_hr is not None and mean_hr.ndim == 4:
+            mean_hr = mean_hr.to(memory_format=torch.channels_last)
+
     # conditioning = [mean_hr, img_lr, global_lr]
     x_lr = img_lr
     if mean_hr is not None:
@@ -269,7 +413,7 @@ def deterministic_sampler(
             f"{img_lr.shape[0]} vs {latents.shape[0]}."
         )
 
-    if solver not in ["euler", "heun"]:
+    if solver not in ["euler", "heun", "dpmpp_2m"]:
         raise ValueError(f"Unknown solver {solver}")
     if discretization not in ["vp", "ve", "iddpm", "edm"]:
         raise ValueError(f"Unknown discretization {discretization}")
@@ -277,6 +421,13 @@ def deterministic_sampler(
         raise ValueError(f"Unknown schedule {schedule}")
     if scaling not in ["vp", "none"]:
         raise ValueError(f"Unknown scaling {scaling}")
+    if parareal_iters > 0:
+        if solver not in ["euler", "heun"]:
+            raise ValueError(f"Parareal is not supported with solver {solver}")
+        if S_churn != 0:
+            raise ValueError("Parareal requires S_churn=0")
+        if patching is not None:
+            raise ValueError("Parareal is not supported with patching")
 
     # Helper functions for VP & VE noise level schedules.
     vp_sigma = (
@@ -320,15 +471,28 @@ def deterministic_sampler(
     if patching:
         # Patched conditioning [x_lr, mean_hr]
         # (batch_size * patch_num, C_in + C_out, patch_shape_y, patch_shape_x)
-        x_lr = _apply_wrapper_Cin_channels(
+        x_lr = _maybe_compile(_apply_wrapper_Cin_channels, compile_patching)(
             patching=patching, input=x_lr, additional_input=img_lr
         )
 
+        # The positional embedding does not change between the evaluations of
+        # the network, so its patches are extracted only once and reused as
+        # long as the same (unmodified) embedding tensor is passed. Inference
+        # tensors have no version counter and are only compared by identity.
+        embedding_cache = [None, None, None]  # emb, emb._version, patches
+
         # Function to select the correct positional embedding for each patch
         def patch_embedding_selector(emb):
             # emb: (N_pe, image_shape_y, image_shape_x)
             # return: (batch_size * patch_num, N_pe, patch_shape_y, patch_shape_x)
-            return patching.apply(emb[None].expand(batch_size, -1, -1, -1))
+            version = None if emb.is_inference() else emb._version
+            if embedding_cache[0] is not emb or embedding_cache[1] != version:
+                embedding_cache[:] = (
+                    emb,
+                    version,
+                    patching.apply(emb[None].expand(batch_size, -1, -1, -1)),
+                )
+            return embedding_cache[2]
 
     else:
         patch_embedding_selector = None
@@ -341,8 +505,9 @@ def deterministic_sampler(
     )
     vp_beta_min = np.log(sigma_max**2 + 1) - 0.5 * vp_beta_d
 
-    # Define time steps in terms of noise level.
-    step_indices = torch.arange(num_steps, dtype=dtype, device=latents.device)
+    # Define time steps in terms of noise level. The schedule is computed on
+    # the host and only uploaded to the sampling device once it is complete.
+    step_indices = torch.arange(num_steps, dtype=schedule_dtype)
     if discretization == "vp":
         orig_t_steps = 1 + step_indices / (num_steps - 1) * (epsilon_s - 1)
         sigma_steps = vp_sigma(vp_beta_d, vp_beta_min)(orig_t_steps)
@@ -352,12 +517,15 @@ def deterministic_sampler(
         )
         sigma_steps = ve_sigma(orig_t_steps)
     elif discretization == "iddpm":
-        u = torch.zeros(M + 1, dtype=dtype, device=latents.device)
-        alpha_bar = lambda j: (0.5 * np.pi * j / M / (C_2 + 1)).sin() ** 2
-        for j in torch.arange(M, 0, -1, device=latents.device):  # M, ..., 1
-            u[j - 1] = (
-                (u[j] ** 2 + 1) / (alpha_bar(j - 1) / alpha_bar(j)).clip(min=C_1) - 1
-            ).sqrt()
+        # The recursion is sequential and on scalars: run it on the host in
+        # float64 and upload the result at once, instead of launching M small
+        # kernels on the device.
+        alpha_bar = np.sin(0.5 * np.pi * np.arange(M + 1) / M / (C_2 + 1)) ** 2
+        ratio = np.maximum(alpha_bar[:-1] / alpha_bar[1:], C_1)
+        u = np.zeros(M + 1, dtype=np.float64)
+        for j in range(M, 0, -1):  # M, ..., 1
+            u[j - 1] = np.sqrt((u[j] ** 2 + 1) / ratio[j - 1] - 1)
+        u = torch.from_numpy(u).to(dtype=schedule_dtype)
         u_filtered = u[torch.logical_and(u >= sigma_min, u <= sigma_max)]
         sigma_steps = u_filtered[
             ((len(u_filtered) - 1) / (num_steps - 1) * step_indices)
@@ -383,7 +551,7 @@ def deterministic_sampler(
         sigma_inv = ve_sigma_inv
     else:
         sigma = lambda t: t
-        sigma_deriv = lambda t: 1
+        sigma_deriv = lambda t: torch.ones_like(t)
         sigma_inv = lambda sigma: sigma
 
     # Define scaling schedule.
@@ -391,16 +559,115 @@ def deterministic_sampler(
         s = lambda t: 1 / (1 + sigma(t) ** 2).sqrt()
         s_deriv = lambda t: -sigma(t) * sigma_deriv(t) * (s(t) ** 3)
     else:
-        s = lambda t: 1
-        s_deriv = lambda t: 0
+        s = lambda t: torch.ones_like(t)
+        s_deriv = lambda t: torch.zeros_like(t)
 
     # Compute final time steps based on the corresponding noise levels.
     t_steps = sigma_inv(net.round_sigma(sigma_steps))
     t_steps = torch.cat([t_steps, torch.zeros_like(t_steps[:1])])  # t_N = 0
 
+    # Precompute the schedule at every time step, so that the sampling loop
+    # only indexes into these tensors instead of re-evaluating the lambdas.
+    sigma_t = sigma(t_steps)
+    s_t = s(t_steps)
+    gamma = torch.where(
+        torch.logical_and(sigma_t[:-1] >= S_min, sigma_t[:-1] <= S_max),
+        sigma_t.new_tensor(min(S_churn / num_steps, np.sqrt(2) - 1)),
+        0,
+    )
+    # Temporarily increased noise levels and time steps of the 2nd order
+    # correction.
+    t_hat = sigma_inv(net.round_sigma(sigma_t[:-1] + gamma * sigma_t[:-1]))
+    h = t_steps[1:] - t_hat
+    alpha_h = alpha * h
+    t_prime = t_hat + alpha_h
+    # Weights of the slopes in the 2nd order correction.
+    w_cur = h.new_tensor(1 - 1 / (2 * alpha))
+    w_prime = h.new_tensor(1 / (2 * alpha))
+    sigma_hat, sigma_deriv_hat = sigma(t_hat), sigma_deriv(t_hat)
+    s_hat, s_deriv_hat = s(t_hat), s_deriv(t_hat)
+    sigma_prime, sigma_deriv_prime = sigma(t_prime), sigma_deriv(t_prime)
+    s_prime, s_deriv_prime = s(t_prime), s_deriv(t_prime)
+    # Coefficients of the slope d = c_x * x - c_denoised * denoised at t_hat
+    # and t_prime, computed once for all the time-steps.
+    c_x_hat = sigma_deriv_hat / sigma_hat + s_deriv_hat / s_hat
+    c_denoised_hat = sigma_deriv_hat * s_hat / sigma_hat
+    c_x_prime = sigma_deriv_prime / sigma_prime + s_deriv_prime / s_prime
+    c_denoised_prime = sigma_deriv_prime * s_prime / sigma_prime
+    # Scaling of x_cur and amplitude of the noise added to obtain x_hat.
+    x_scale = s_hat / s_t[:-1]
+    noise_scale = (
+        (sigma_hat**2 - sigma_t[:-1] ** 2).clip(min=0).sqrt() * s_hat * S_noise
+    )
+    if solver == "dpmpp_2m":
+        # DPM-Solver++(2M) integrates the ODE exactly in the half log-SNR
+        # lambda = -log(sigma), with a linear extrapolation of the denoised
+        # output from the previous time-step.
+        lambda_hat = -sigma_hat.log()
+        h_lambda = -sigma_t[1:].log() - lambda_hat
+        c_x_dpm = (s_t[1:] / s_hat * sigma_t[1:] / sigma_hat).to(
+            device=latents.device, dtype=dtype
+        )
+        c_denoised_dpm = (-s_t[1:] * torch.expm1(-h_lambda)).to(
+            device=latents.device, dtype=dtype
+        )
+        w_cur_dpm = torch.ones_like(h_lambda)
+        w_prev_dpm = torch.zeros_like(h_lambda)
+        # The first step has no previous output, and the last step (to
+        # sigma = 0) is 1st order.
+        r = (lambda_hat[1:-1] - lambda_hat[:-2]) / h_lambda[1:-1]
+        w_cur_dpm[1:-1] = 1 + 1 / (2 * r)
+        w_prev_dpm[1:-1] = -1 / (2 * r)
+        w_cur_dpm, w_prev_dpm = (
+            v.to(device=latents.device, dtype=dtype) for v in (w_cur_dpm, w_prev_dpm)
+        )
+    # Noise is only drawn at the time-steps where it is injected, that is
+    # none of them with the default S_churn=0. Read on the host so that no
+    # device synchronization is needed.
+    add_noise = (noise_scale != 0).tolist()
+
+    # Upload the schedule to the sampling device and precision
+    (
+        sigma_t,
+        s_t,
+        h,
+        alpha_h,
+        w_cur,
+        w_prime,
+        sigma_hat,
+        s_hat,
+        c_x_hat,
+        c_denoised_hat,
+        sigma_prime,
+        s_prime,
+        c_x_prime,
+        c_denoised_prime,
+        x_scale,
+        noise_scale,
+    ) = (
+        v.to(device=latents.device, dtype=dtype)
+        for v in (
+            sigma_t,
+            s_t,
+            h,
+            alpha_h,
+            w_cur,
+            w_prime,
+            sigma_hat,
+            s_hat,
+            c_x_hat,
+            c_denoised_hat,
+            sigma_prime,
+            s_prime,
+            c_x_prime,
+            c_denoised_prime,
+            x_scale,
+            noise_scale,
+        )
+    )
+
     # Main sampling loop.
-    t_next = t_steps[0]
-    x_next = latents.to(dtype) * (sigma(t_next) * s(t_next))
+    x_next = latents.to(dtype) * (sigma_t[0] * s_t[0])
 
     optional_args = {}
     if lead_time_label is not None:
@@ -408,100 +675,178 @@ def deterministic_sampler(
     if patching:
         optional_args["embedding_selector"] = patch_embedding_selector
 
-    for i, (t_cur, t_next) in enumerate(zip(t_steps[:-1], t_steps[1:])):  # 0, ..., N-1
-        x_cur = x_next
-
-        # Increase noise temporarily.
-        gamma = (
-            min(S_churn / num_steps, np.sqrt(2) - 1)
-            if S_min <= sigma(t_cur) <= S_max
-            else 0
+    # The patching wrappers and the calling convention of the network do not
+    # change during sampling: select them once outside of the loop.
+    apply_wrapper = _apply_wrapper_select(patching=patching, compile=compile_patching)
+    fuse_wrapper = _maybe_compile(_fuse_wrapper, compile_patching)
+    euler_step = _maybe_compile(_euler_step, compile_solver, fullgraph=True)
+    heun_step = _maybe_compile(_heun_step, compile_solver, fullgraph=True)
+    dpmpp_2m_step = _maybe_compile(_dpmpp_2m_step, compile_solver, fullgraph=True)
+    if isinstance(net, EDMPrecond):
+        # Conditioning info is passed as keyword arg
+        net_call = lambda x, sigma_x, x_lr, class_labels, optional_args: net(
+            x, sigma_x, condition=x_lr, class_labels=class_labels, **optional_args
+        )
+    else:
+        net_call = lambda x, sigma_x, x_lr, class_labels, optional_args: net(
+            x, x_lr, sigma_x, class_labels, **optional_args
         )
-        t_hat = sigma_inv(net.round_sigma(sigma(t_cur) + gamma * sigma(t_cur)))
-        x_hat = s(t_hat) / s(t_cur) * x_cur + (
-            sigma(t_hat) ** 2 - sigma(t_cur) ** 2
-        ).clip(min=0).sqrt() * s(t_hat) * S_noise * randn_like(x_cur)
-
-        # Euler step. Perform patching operation on score tensor if patch-based
-        # generation is used denoised = net(x_hat, t_hat,
-        # class_labels,lead_time_label=lead_time_label)
-
-        h = t_next - t_hat
-        x_hat_batch = _apply_wrapper_select(input=x_hat, patching=patching)(
-            patching=patching, input=x_hat
-        ).to(latents.device)
-
-        if isinstance(net, EDMPrecond):
-            # Conditioning info is passed as keyword arg
-            denoised = net(
-                x_hat_batch / s(t_hat),
-                sigma(t_hat),
-                condition=x_lr,
-                class_labels=class_labels,
-                **optional_args,
-            ).to(dtype)
-        else:
-            denoised = net(
-                x_hat_batch / s(t_hat),
-                x_lr,
-                sigma(t_hat),
-                class_labels,
-                **optional_args,
-            ).to(dtype)
 
+    # Conditioning of the network, repeated along the batch dimension when
+    # several time-steps are evaluated in the same batch (with Parareal).
+    conditioning = {1: (x_lr, class_labels, optional_args)}
+
+    def repeat_conditioning(reps):
+        if reps not in conditioning:
+            repeat = lambda v: v.repeat(reps, *([1] * (v.ndim - 1)))
+            conditioning[reps] = (
+                repeat(x_lr),
+                None if class_labels is None else repeat(class_labels),
+                {k: repeat(v) for k, v in optional_args.items()},
+            )
+        return conditioning[reps]
+
+    def denoise(x, sigma_x, s_x):
+        # Perform patching operation on score tensor if patch-based generation
+        # is used
+        # (batch_size * patch_num, C_out, patch_shape_y, patch_shape_x)
+        x_batch = apply_wrapper(patching=patching, input=x)
+        denoised = net_call(
+            _maybe_scale(x_batch, s_x, scaling),
+            sigma_x,
+            *repeat_conditioning(x_batch.shape[0] // x_lr.shape[0]),
+        )
         if patching:
-            # Un-patch the denoised image
+            # Un-patch the denoised image, overlapping patches being averaged
+            # in the sampling precision
             # (batch_size, C_out, img_shape_y, img_shape_x)
-            denoised = _fuse_wrapper(
-                patching=patching, input=denoised, batch_size=batch_size
+            denoised = fuse_wrapper(
+                patching=patching, input=denoised.to(dtype), batch_size=batch_size
             )
+        return denoised
+
+    def at(v, i):
+        # Schedule value at the time-step i, or at a tensor of per-sample
+        # time-steps broadcastable against a batch of images.
+        return v[i] if isinstance(i, int) else v[i].reshape(-1, 1, 1, 1)
+
+    def ode_step(x_hat, i, second_order, step=None):
+        # Euler step from x_hat at t_hat[i], followed by the 2nd order
+        # correction if second_order is True. The step size defaults to
+        # t_{i+1} - t_hat[i].
+        step = at(h, i) if step is None else step
+        denoised = denoise(x_hat, at(sigma_hat, i), at(s_hat, i))
+        c_x, c_denoised = at(c_x_hat, i), at(c_denoised_hat, i)
+        if not second_order:
+            _, x_next = euler_step(x_hat, denoised, c_x, c_denoised, step)
+            return x_next
+        d_cur, x_prime = euler_step(x_hat, denoised, c_x, c_denoised, at(alpha_h, i))
+        denoised = denoise(x_prime, at(sigma_prime, i), at(s_prime, i))
+        return heun_step(
+            x_hat,
+            x_prime,
+            d_cur,
+            denoised,
+            at(c_x_prime, i),
+            at(c_denoised_prime, i),
+            step,
+            w_cur,
+            w_prime,
+        )
 
-        d_cur = (
-            sigma_deriv(t_hat) / sigma(t_hat) + s_deriv(t_hat) / s(t_hat)
-        ) * x_hat - sigma_deriv(t_hat) * s(t_hat) / sigma(t_hat) * denoised
-        x_prime = x_hat + alpha * h * d_cur
-        t_prime = t_hat + alpha * h
-
-        # Apply 2nd order correction.
-        if solver == "euler" or i == num_steps - 1:
-            x_next = x_hat + h * d_cur
-        else:
-            # Patched input
-            # (batch_size * patch_num, C_out, patch_shape_y, patch_shape_x)
-            x_prime_batch = _apply_wrapper_select(input=x_prime, patching=patching)(
-                patching=patching, input=x_prime
-            ).to(latents.device)
-
-            if isinstance(net, EDMPrecond):
-                # Conditioning info is passed as keyword arg
-                denoised = net(
-                    x_prime_batch / s(t_prime),
-                    sigma(t_prime),
-                    condition=x_lr,
-                    class_labels=class_labels,
-                    **optional_args,
-                ).to(dtype)
-            else:
-                denoised = net(
-                    x_prime_batch / s(t_prime),
-                    x_lr,
-                    sigma(t_prime),
-                    class_labels,
-                    **optional_args,
-                ).to(dtype)
-
-            if patching:
-                # Un-patch the denoised image
-                # (batch_size, C_out, img_shape_y, img_shape_x)
-                denoised = _fuse_wrapper(
-                    patching=patching, input=denoised, batch_size=batch_size
+    def parareal(x_init):
+        # The time-steps are grouped in blocks of block_len time-steps. The
+        # coarse propagator is a single Euler step over a block, and the fine
+        # propagator applies the solver to all the time-steps of a block,
+        # for all the blocks at once along the batch dimension.
+        block_len = int(np.ceil(np.sqrt(num_steps)))
+        starts = list(range(0, num_steps, block_len))
+        ends = starts[1:] + [num_steps]
+        h_block = (t_steps[ends] - t_hat[starts]).to(device=latents.device, dtype=dtype)
+
+        def advance(x, i, second_order, step=None):
+            if scaling != "none":
+                x = at(x_scale, i) * x
+            return ode_step(x, i, second_order, step)
+
+        def coarse(x, j):
+            return advance(x, starts[j], False, h_block[j])
+
+        def fine(x):
+            # x: (num_blocks * batch_size, C_out, img_shape_y, img_shape_x)
+            for m in range(block_len):
+                # Only the last block can be shorter than block_len, so the
+                # blocks that still have time-steps to integrate are the first
+                # num_active ones.
+                num_active = sum(start + m < end for start, end in zip(starts, ends))
+                i = torch.tensor(
+                    [start + m for start in starts[:num_active]],
+                    device=latents.device,
+                ).repeat_interleave(batch_size)
+                # The last time-step is always an Euler step
+                num_heun = 0
+                if solver == "heun":
+                    num_heun = num_active - int(i[-1] == num_steps - 1)
+                k_heun, k_active = num_heun * batch_size, num_active * batch_size
+                x_parts = []
+                if k_heun > 0:
+                    x_parts.append(advance(x[:k_heun], i[:k_heun], True))
+                if k_active > k_heun:
+                    x_parts.append(
+                        advance(x[k_heun:k_active], i[k_heun:k_active], False)
+                    )
+                x = torch.cat(x_parts + [x[k_active:]])
+            return x.split(batch_size)
+
+        # Initial trajectory, from the coarse propagator.
+        x_blocks = [x_init]
+        x_coarse = []
+        for j in range(len(starts)):
+            x_coarse.append(coarse(x_blocks[j], j))
+            x_blocks.append(x_coarse[j])
+
+        # Parareal corrections.
+        for _ in range(parareal_iters):
+            x_fine = fine(torch.cat(x_blocks[:-1]))
+            x_blocks = [x_init]
+            for j in range(len(starts)):
+                x_coarse_new = coarse(x_blocks[j], j)
+                x_blocks.append(x_fine[j] + x_coarse_new - x_coarse[j])
+                x_coarse[j] = x_coarse_new
+        return x_blocks[-1]
+
+    # Unless the sampler is differentiated, no autograd graph is recorded
+    # for the evaluations of the network.
+    with _sampling_mode(differentiable):
+        if parareal_iters > 0:
+            return parareal(x_next)
+
+        for i in range(num_steps):  # 0, ..., N-1
+            x_cur = x_next
+
+            # Increase noise temporarily. Without scaling, x_scale is 1.
+            x_hat = x_cur if scaling == "none" else x_scale[i] * x_cur
+            if add_noise[i]:
+                x_hat = x_hat + noise_scale[i] * randn_like(x_cur)
+
+            if solver == "dpmpp_2m":
+                # Multistep update, the weight of denoised_prev is 0 at the first
+                # step.
+                denoised = denoise(x_hat, sigma_hat[i], s_hat[i])
+                if i == 0:
+                    denoised_prev = denoised
+                x_next = dpmpp_2m_step(
+                    x_hat,
+                    denoised,
+                    denoised_prev,
+                    c_x_dpm[i],
+                    c_denoised_dpm[i],
+                    w_cur_dpm[i],
+                    w_prev_dpm[i],
                 )
-
-            d_prime = (
-                sigma_deriv(t_prime) / sigma(t_prime) + s_deriv(t_prime) / s(t_prime)
-            ) * x_prime - sigma_deriv(t_prime) * s(t_prime) / sigma(t_prime) * denoised
-            x_next = x_hat + h * (
-                (1 - 1 / (2 * alpha)) * d_cur + 1 / (2 * alpha) * d_prime
-            )
+                denoised_prev = denoised
+            else:
+                # Euler step and 2nd order correction.
+                x_next = ode_step(x_hat, i, solver == "heun" and i < num_steps - 1)
 
     return x_next
@@ -14,6 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
+import tarfile
+
 import pytest
 import torch
 from pytest_utils import import_or_fail
@@ -28,22 +31,78 @@ from physicsnemo.models.diffusion.preconditioning import (
 from physicsnemo.models.module import Module
 
 
-def test_EDMPrecondSuperResolution_forward():
-    b, c_target, x, y = 1, 3, 8, 8
-    c_cond = 4
-
-    # Create an instance of the preconditioner
-    model = EDMPrecondSuperResolution(
-        img_resolution=x,
-        img_in_channels=c_cond,
-        img_out_channels=c_target,
+def _check_weights_only_serialization(module, model_path, tmp_path):
+    """Checks that the weights of a saved model load with weights_only=True"""
+    expected = module.state_dict()
+    # Weights stored in the .mdlus archive
+    with tarfile.open(model_path) as tar:
+        buffer = io.BytesIO(tar.extractfile("model.pt").read())
+    state_dict = torch.load(buffer, weights_only=True)
+    assert state_dict.keys() == expected.keys()
+    assert all(torch.equal(state_dict[key], expected[key]) for key in expected)
+    # Weights in the zipfile serialization format
+    weights_path = tmp_path / "weights.pt"
+    torch.save(expected, weights_path, _use_new_zipfile_serialization=True)
+    state_dict = torch.load(weights_path, weights_only=True)
+    assert all(torch.equal(state_dict[key], expected[key]) for key in expected)
+
+
+# Building the SongUNet backbones dominates the runtime of the forward tests,
+# so each preconditioner is only built once per module and reused by all the
+# tests that only run forward passes with it.
+@pytest.fixture(scope="module")
+def edm_precond_sr():
+    return EDMPrecondSuperResolution(
+        img_resolution=8,
+        img_in_channels=4,
+        img_out_channels=3,
         use_fp16=False,
         model_type="SongUNet",
+    ).eval()
+
+
+@pytest.fixture(scope="module")
+def sr_inputs():
+    # (latents, img_lr, sigma) shared by the forward tests of the (8, 4, 3)
+    # super-resolution models
+    b, c_target, x, y, c_cond = 1, 3, 8, 8, 4
+    return (
+        torch.ones((b, c_target, x, y)),
+        torch.arange(b * c_cond * x * y, dtype=torch.float32).reshape(
+            (b, c_cond, x, y)
+        ),
+        torch.tensor([10.0]),
     )
 
-    latents = torch.ones((b, c_target, x, y))
-    img_lr = torch.arange(b * c_cond * x * y).reshape((b, c_cond, x, y))
-    sigma = torch.tensor([10.0])
+
+@pytest.fixture(scope="module")
+def edm_precond(request):
+    # request.param = [cond_ch, out_ch]
+    cond_ch, out_ch = request.param
+    model = EDMPrecond(
+        img_resolution=[32, 64],
+        img_channels=99,  # dummy value, should be overwritten by following args
+        img_in_channels=out_ch + cond_ch,
+        img_out_channels=out_ch,
+        model_type="SongUNet",
+    ).eval()
+    return model, cond_ch, out_ch
+
+
+@pytest.fixture(scope="module")
+def dfsr_input():
+    # Input shared by the DFSR tests, of resolution img_resolution = 64
+    generator = torch.Generator().manual_seed(0)
+    return torch.randn(1, 3, 64, 64, generator=generator)
+
+
+@torch.inference_mode()
+def test_EDMPrecondSuperResolution_forward(edm_precond_sr, sr_inputs):
+    b, c_target, x, y = 1, 3, 8, 8
+
+    model = edm_precond_sr
+
+    latents, img_lr, sigma = sr_inputs
 
     # Forward pass
     output = model(
@@ -56,7 +115,8 @@ def test_EDMPrecondSuperResolution_forward():
     assert output.shape == (b, c_target, x, y)
 
 
-def test_EDMPrecondSuperResolution_fp16_forward():
+@torch.inference_mode()
+def test_EDMPrecondSuperResolution_fp16_forward(edm_precond_sr, sr_inputs):
     b, c_target, x, y = 1, 3, 8, 8
     c_cond = 4
 
@@ -67,19 +127,11 @@ def test_EDMPrecondSuperResolution_fp16_forward():
         img_out_channels=c_target,
         model_type="SongUNet",
         use_fp16=True,
-    )
+    ).eval()
 
-    model_fp32 = EDMPrecondSuperResolution(
-        img_resolution=x,
-        img_in_channels=c_cond,
-        img_out_channels=c_target,
-        model_type="SongUNet",
-        use_fp16=False,
-    )
+    model_fp32 = edm_precond_sr
 
-    latents = torch.ones((b, c_target, x, y))
-    img_lr = torch.arange(b * c_cond * x * y).reshape((b, c_cond, x, y))
-    sigma = torch.tensor([10.0])
+    latents, img_lr, sigma = sr_inputs
 
     # Forward pass
     output_fp16 = model_fp16(
@@ -98,8 +150,12 @@ def test_EDMPrecondSuperResolution_fp16_forward():
     assert output_fp16.shape == (b, c_target, x, y)
 
     # Assert the fp16 output and fp32 output are close
-    assert torch.allclose(output_fp16, output_fp32, rtol=1e-3, atol=1e-3), (
-        "FP16 and FP32 outputs differ more than allowed"
+    torch.testing.assert_close(
+        output_fp16,
+        output_fp32,
+        rtol=1e-3,
+        atol=1e-3,
+        msg=lambda msg: f"FP16 and FP32 outputs differ more than allowed\n{msg}",
     )
 
 
@@ -112,26 +168,19 @@ def test_EDMPrecondSuperResolution_serialization(tmp_path, pytestconfig):
     module.save(model_path.as_posix())
     loaded = Module.from_checkpoint(model_path.as_posix())
     assert isinstance(loaded, EDMPrecondSuperResolution)
+    _check_weights_only_serialization(module, model_path, tmp_path)
     save_checkpoint(path=tmp_path, models=module, epoch=1)
     epoch = load_checkpoint(path=tmp_path)
     assert epoch == 1
 
 
-@pytest.mark.parametrize("channels", [[0, 4], [3, 8], [3, 5]])
-def test_EDMPrecond_forward(channels):
+@pytest.mark.parametrize("edm_precond", [[0, 4], [3, 8], [3, 5]], indirect=True)
+@torch.inference_mode()
+def test_EDMPrecond_forward(edm_precond):
     res = [32, 64]
-    cond_ch, out_ch = channels
+    model, cond_ch, out_ch = edm_precond
     b = 1
 
-    # Create an instance of the preconditioner
-    model = EDMPrecond(
-        img_resolution=res,
-        img_channels=99,  # dummy value, should be overwritten by following args
-        img_in_channels=out_ch + cond_ch,
-        img_out_channels=out_ch,
-        model_type="SongUNet",
-    )
-
     latents = torch.randn(b, out_ch, *res)
     sigma = torch.tensor([10.0])
 
@@ -154,9 +203,11 @@ def test_EDMPrecond_forward(channels):
     assert output.shape == (b, out_ch, *res)
 
 
-def test_VEPrecond_dfsr():
-    b, c, x, y = 1, 3, 256, 256
-    img_resolution = 256
+@torch.inference_mode()
+def test_VEPrecond_dfsr(dfsr_input):
+    # Small resolution that still goes through the 4 levels of channel_mult,
+    # only the output shape is checked
+    img_resolution = 64
     img_channels = 3
     model_kwargs = {
         "embedding_type": "positional",
@@ -182,15 +233,16 @@ def test_VEPrecond_dfsr():
         **model_kwargs,
     )
 
-    xt = torch.randn(b, c, x, y)
-    t = torch.randn(b)
+    xt = dfsr_input
+    t = torch.randn(xt.shape[0])
     pred_t = preconditioned_model(xt, t)
     assert xt.size() == pred_t.size()
 
 
-def test_voriticity_residual_method():
-    b, c, x, y = 1, 3, 256, 256
-    img_resolution = 256
+def test_voriticity_residual_method(dfsr_input):
+    # Small resolution that still goes through the 4 levels of channel_mult,
+    # only the output shape is checked
+    img_resolution = 64
     img_channels = 3
     dataset_mean = 5.85e-05
     dataset_scale = 4.79
@@ -218,7 +270,7 @@ def test_voriticity_residual_method():
         **model_kwargs,
     )
 
-    xt = torch.randn(b, c, x, y)
+    xt = dfsr_input
     dx_t = preconditioned_model.voriticity_residual(
         (xt * dataset_scale + dataset_mean) / dataset_scale
     )
@@ -237,48 +289,41 @@ def test_EDMPrecondSuperResolution_properties():
         model_type="SongUNet",
     )
 
+    # Traverse the submodules (including model.model itself) only once
+    amp_subs, profile_subs = [], []
+    for sub in model.model.modules():
+        if hasattr(sub, "amp_mode"):
+            amp_subs.append(sub)
+        if hasattr(sub, "profile_mode"):
+            profile_subs.append(sub)
+
     # Default value should be False
     assert model.amp_mode is False
 
     # Enable amp_mode and verify propagation
     model.amp_mode = True
     assert model.amp_mode is True
-    if hasattr(model.model, "amp_mode"):
-        assert model.model.amp_mode is True
-    for sub in model.model.modules():
-        if hasattr(sub, "amp_mode"):
-            assert sub.amp_mode is True
+    assert all(sub.amp_mode is True for sub in amp_subs)
 
     # Disable again and verify
     model.amp_mode = False
     assert model.amp_mode is False
-    if hasattr(model.model, "amp_mode"):
-        assert model.model.amp_mode is False
-    for sub in model.model.modules():
-        if hasattr(sub, "amp_mode"):
-            assert sub.amp_mode is False
+    assert all(sub.amp_mode is False for sub in amp_subs)
 
     # Do the same for profile_mode
     # Enable profile_mode and verify propagation
     model.profile_mode = True
     assert model.profile_mode is True
-    if hasattr(model.model, "profile_mode"):
-        assert model.model.profile_mode is True
-    for sub in model.model.modules():
-        if hasattr(sub, "profile_mode"):
-            assert sub.profile_mode is True
+    assert all(sub.profile_mode is True for sub in profile_subs)
 
     # Disable again and verify
     model.profile_mode = False
     assert model.profile_mode is False
-    if hasattr(model.model, "profile_mode"):
-        assert model.model.profile_mode is False
-    for sub in model.model.modules():
-        if hasattr(sub, "profile_mode"):
-            assert sub.profile_mode is False
+    assert all(sub.profile_mode is False for sub in profile_subs)
 
 
-def test_EDMPrecondSR_forward():
+@torch.inference_mode()
+def test_EDMPrecondSR_forward(sr_inputs):
     b, c_target, x, y = 1, 3, 8, 8
     c_cond = 4
 
@@ -292,9 +337,7 @@ def test_EDMPrecondSR_forward():
         model_type="SongUNet",
     )
 
-    latents = torch.ones((b, c_target, x, y))
-    img_lr = torch.arange(b * c_cond * x * y).reshape((b, c_cond, x, y))
-    sigma = torch.tensor([10.0])
+    latents, img_lr, sigma = sr_inputs
 
     # Forward pass
     output = model(
@@ -318,6 +361,7 @@ def test_EDMPrecondSR_serialization(tmp_path, pytestconfig):
     module.save(model_path.as_posix())
     loaded = Module.from_checkpoint(model_path.as_posix())
     assert isinstance(loaded, EDMPrecondSR)
+    _check_weights_only_serialization(module, model_path, tmp_path)
     save_checkpoint(path=tmp_path, models=module, epoch=1)
     epoch = load_checkpoint(path=tmp_path)
     assert epoch == 1
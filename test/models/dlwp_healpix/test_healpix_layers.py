@@ -69,6 +69,12 @@ def test_HEALPixFoldFaces_forward(device, pytestconfig):
     assert fold_func(invar).shape == outvar.shape
     assert fold_func(invar).stride() != outvar.stride()
 
+    # folding is a view of contiguous and channels-last inputs
+    assert HEALPixFoldFaces()(invar).data_ptr() == invar.data_ptr()
+    N, F, C, H, W = tensor_size
+    invar = torch.ones(N, F, H, W, C, device=device).permute(0, 1, 4, 2, 3)
+    assert fold_func(invar).data_ptr() == invar.data_ptr()
+
 
 @import_or_fail("hydra")
 @pytest.mark.parametrize("device", ["cuda:0", "cpu"])
@@ -100,6 +106,13 @@ def test_HEALPixUnfoldFaces_forward(device, pytestconfig):
 
     outvar = unfold_func(invar)
     assert outvar.shape == output_size
+    assert outvar.data_ptr() == invar.data_ptr()
+
+    # unfolding is a view of channels-last inputs as well
+    invar = invar.to(memory_format=torch.channels_last)
+    outvar = HEALPixUnfoldFaces(enable_nhwc=True)(invar)
+    assert outvar.shape == output_size
+    assert outvar.data_ptr() == invar.data_ptr()
 
 
 HEALPixPadding_testdata = [
@@ -180,6 +180,8 @@ def test_HEALPixUNet_initialize(
         output_time_dim=output_time_dim,
     ).to(device)
     assert isinstance(model, HEALPixUNet)
+    # checkpoint file names are built from the model name
+    assert model.meta.name == "PhysicsNeMoModule"
 
     # test fail case for bad input and output time dims
     with pytest.raises(
@@ -388,3 +390,425 @@ def test_HEALPixUNet_forward(
 
     del inputs, model
     torch.cuda.empty_cache()
+
+
+@import_or_fail("omegaconf")
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_HEALPixUNet_cuda_graphs(
+    device,
+    unet_encoder_dict,
+    unet_decoder_dict,
+    test_data,
+    insolation_data,
+    constant_data,
+    pytestconfig,
+):
+    in_channels = 3
+    out_channels = 3
+    n_constants = 2
+    decoder_input_channels = 1
+    input_time_dim = 2
+    output_time_dim = 4
+    size = 16
+
+    fix_random_seeds(seed=42)
+    x = test_data(
+        time_dim=input_time_dim, channels=in_channels, img_size=size, device=device
+    )
+    decoder_inputs = insolation_data(
+        time_dim=output_time_dim, img_size=size, device=device
+    )
+    constants = constant_data(channels=n_constants, img_size=size, device=device)
+    inputs = [x, decoder_inputs, constants]
+
+    model = HEALPixUNet(
+        encoder=unet_encoder_dict,
+        decoder=unet_decoder_dict,
+        input_channels=in_channels,
+        output_channels=out_channels,
+        n_constants=n_constants,
+        decoder_input_channels=decoder_input_channels,
+        input_time_dim=input_time_dim,
+        output_time_dim=output_time_dim,
+        enable_cuda_graphs=True,
+    ).to(device)
+    model.eval()
+
+    with torch.no_grad():
+        # graphs are captured on the first call and replayed on the second one
+        outputs = model(inputs)
+        replayed = model(inputs)
+        model.enable_cuda_graphs = False
+        eager = model(inputs)
+
+    assert torch.allclose(outputs, eager, rtol=1e-4, atol=1e-5)
+    assert torch.allclose(replayed, eager, rtol=1e-4, atol=1e-5)
+
+    del inputs, model
+    torch.cuda.empty_cache()
+
+
+@import_or_fail("omegaconf")
+def test_HEALPixUNet_cuda_graphs_recurrent(
+    unet_encoder_dict, unet_decoder_dict, pytestconfig
+):
+    # a recurrent decoder keeps its hidden state between calls
+    recurrent_block = {
+        "_target_": "physicsnemo.models.dlwp_healpix_layers.ConvGRUBlock",
+        "in_channels": 3,
+        "kernel_size": 1,
+        "_recursive_": False,
+    }
+    decoder_dict = omegaconf.DictConfig(
+        {**unet_decoder_dict, "recurrent_block": recurrent_block}
+    )
+    kwargs = dict(
+        encoder=unet_encoder_dict,
+        decoder=decoder_dict,
+        input_channels=3,
+        output_channels=3,
+        n_constants=2,
+        decoder_input_channels=1,
+        input_time_dim=2,
+        output_time_dim=4,
+    )
+
+    model = HEALPixUNet(**kwargs)
+    assert not model.enable_cuda_graphs
+
+    with pytest.raises(ValueError, match="not supported with recurrent blocks"):
+        HEALPixUNet(enable_cuda_graphs=True, **kwargs)
+
+
+@import_or_fail("omegaconf")
+def test_HEALPixUNet_shape_cache_size(
+    unet_encoder_dict,
+    unet_decoder_dict,
+    test_data,
+    insolation_data,
+    constant_data,
+    pytestconfig,
+):
+    model = HEALPixUNet(
+        encoder=unet_encoder_dict,
+        decoder=unet_decoder_dict,
+        input_channels=3,
+        output_channels=3,
+        n_constants=2,
+        decoder_input_channels=1,
+        input_time_dim=2,
+        output_time_dim=4,
+    )
+    model.max_cached_shapes = 2
+    model.eval()
+
+    constants = constant_data(channels=2, img_size=16)
+    with torch.no_grad():
+        for batch_size in (1, 2, 3):
+            x = test_data(batch_size=batch_size, time_dim=2, channels=3, img_size=16)
+            decoder_inputs = insolation_data(
+                batch_size=batch_size, time_dim=4, img_size=16
+            )
+            model([x, decoder_inputs, constants])
+            assert len(model._shape_cache) == min(batch_size, 2)
+
+
+@import_or_fail("omegaconf")
+def test_HEALPixUNet_inference_mode(
+    unet_encoder_dict,
+    unet_decoder_dict,
+    test_data,
+    insolation_data,
+    constant_data,
+    pytestconfig,
+):
+    model = HEALPixUNet(
+        encoder=unet_encoder_dict,
+        decoder=unet_decoder_dict,
+        input_channels=3,
+        output_channels=3,
+        n_constants=2,
+        decoder_input_channels=1,
+        input_time_dim=2,
+        output_time_dim=4,
+    )
+    model.eval()
+
+    fix_random_seeds(seed=42)
+    x = test_data(time_dim=2, channels=3, img_size=16)
+    decoder_inputs = insolation_data(time_dim=4, img_size=16)
+    constants = constant_data(channels=2, img_size=16)
+    inputs = [x, decoder_inputs, constants]
+
+    # the same shapes run in inference mode, then without and with gradients
+    with torch.inference_mode():
+        inference = model(inputs)
+        # inference tensors can also be passed as constants
+        inference_constants = model([x, decoder_inputs, constants.clone()])
+    with torch.no_grad():
+        no_grad = model(inputs)
+    grad = model(inputs)
+
+    assert torch.allclose(inference_constants, inference)
+    assert torch.allclose(no_grad, inference)
+    assert torch.allclose(grad, inference)
+
+
+@import_or_fail("omegaconf")
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_HEALPixUNet_amp_mode(
+    device,
+    unet_encoder_dict,
+    unet_decoder_dict,
+    test_data,
+    insolation_data,
+    constant_data,
+    pytestconfig,
+):
+    fix_random_seeds(seed=42)
+    x = test_data(time_dim=2, channels=3, img_size=16, device=device)
+    decoder_inputs = insolation_data(time_dim=4, img_size=16, device=device)
+    constants = constant_data(channels=2, img_size=16, device=device)
+    inputs = [x, decoder_inputs, constants]
+
+    model = HEALPixUNet(
+        encoder=unet_encoder_dict,
+        decoder=unet_decoder_dict,
+        input_channels=3,
+        output_channels=3,
+        n_constants=2,
+        decoder_input_channels=1,
+        input_time_dim=2,
+        output_time_dim=4,
+        amp_mode=True,
+    ).to(device)
+
+    # the decoder computes in bfloat16, the outputs are cast back to float32
+    decoder_dtypes = []
+    model.decoder.register_forward_hook(
+        lambda module, args, output: decoder_dtypes.append(output.dtype)
+    )
+    outputs = model(inputs)
+    assert decoder_dtypes == [torch.bfloat16] * model.integration_steps
+    assert outputs.dtype == torch.float32
+
+    model.amp_mode = False
+    expected = model(inputs)
+    assert torch.allclose(outputs, expected, rtol=5e-2, atol=5e-2)
+
+
+@import_or_fail("omegaconf")
+def test_HEALPixUNet_compile(
+    unet_encoder_dict,
+    unet_decoder_dict,
+    test_data,
+    insolation_data,
+    constant_data,
+    pytestconfig,
+):
+    torch._dynamo.reset()
+    fix_random_seeds(seed=42)
+    x = test_data(batch_size=1, time_dim=2, channels=3, img_size=16)
+    decoder_inputs = insolation_data(batch_size=1, time_dim=4, img_size=16)
+    constants = constant_data(channels=2, img_size=16)
+    inputs = [x, decoder_inputs, constants]
+
+    kwargs = dict(
+        encoder=unet_encoder_dict,
+        decoder=unet_decoder_dict,
+        input_channels=3,
+        output_channels=3,
+        n_constants=2,
+        decoder_input_channels=1,
+        input_time_dim=2,
+        output_time_dim=4,
+    )
+    model = HEALPixUNet(**kwargs)
+    compiled = HEALPixUNet(enable_compile=True, **kwargs)
+    # the submodules are compiled in place and keep their state dict keys
+    compiled.load_state_dict(model.state_dict())
+
+    with torch.no_grad():
+        expected = model(inputs)
+        outputs = compiled(inputs)
+    assert torch.allclose(outputs, expected, rtol=1e-4, atol=1e-4)
+
+
+@import_or_fail(["omegaconf", "transformer_engine"])
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_HEALPixUNet_fp8(
+    device,
+    unet_encoder_dict,
+    unet_decoder_dict,
+    test_data,
+    insolation_data,
+    constant_data,
+    pytestconfig,
+):
+    fix_random_seeds(seed=42)
+    x = test_data(time_dim=2, channels=3, img_size=16, device=device)
+    decoder_inputs = insolation_data(time_dim=4, img_size=16, device=device)
+    constants = constant_data(channels=2, img_size=16, device=device)
+    inputs = [x, decoder_inputs, constants]
+
+    model = HEALPixUNet(
+        encoder=unet_encoder_dict,
+        decoder=unet_decoder_dict,
+        input_channels=3,
+        output_channels=3,
+        n_constants=2,
+        decoder_input_channels=1,
+        input_time_dim=2,
+        output_time_dim=4,
+        enable_cuda_graphs=True,
+    ).to(device)
+    model.eval()
+
+    with torch.no_grad():
+        expected = model(inputs)
+        model._shape_cache.clear()
+        model.meta.fp8_gpu = True
+        outputs = model(inputs)
+
+    # only Transformer Engine layers compute in FP8, the others are unchanged
+    assert torch.allclose(outputs, expected, rtol=1e-4, atol=1e-5)
+    # FP8 autocast is not replayed from CUDA graphs
+    assert not any(key[0] == "graph" for key in model._shape_cache)
+
+    del inputs, model
+    torch.cuda.empty_cache()
+
+
+@import_or_fail("omegaconf")
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_HEALPixUNet_stage_inputs(
+    device,
+    unet_encoder_dict,
+    unet_decoder_dict,
+    test_data,
+    insolation_data,
+    constant_data,
+    pytestconfig,
+):
+    fix_random_seeds(seed=42)
+    x = test_data(time_dim=2, channels=3, img_size=16)
+    decoder_inputs = insolation_data(time_dim=4, img_size=16)
+    constants = constant_data(channels=2, img_size=16)
+    inputs = [x, decoder_inputs, constants]
+
+    model = HEALPixUNet(
+        encoder=unet_encoder_dict,
+        decoder=unet_decoder_dict,
+        input_channels=3,
+        output_channels=3,
+        n_constants=2,
+        decoder_input_channels=1,
+        input_time_dim=2,
+        output_time_dim=4,
+    ).to(device)
+
+    staged = model._stage_inputs(inputs)
+    if model.device.type != "cuda":
+        # inputs are only staged for models on the GPU
+        assert all(a is b for a, b in zip(staged, inputs))
+        return
+
+    for tensor, staged_tensor in zip(inputs, staged):
+        assert staged_tensor.device == model.device
+        assert torch.equal(staged_tensor.cpu(), tensor)
+    buffers = [
+        entry["buffer"]
+        for key, entry in model._shape_cache.items()
+        if key[0] == "pinned"
+    ]
+    assert len(buffers) == len(inputs)
+    assert all(buffer.is_pinned() for buffer in buffers)
+
+    # the pinned buffers are reused by the next calls with the same shapes
+    with torch.no_grad():
+        outputs = model(inputs)
+        expected = model([tensor.to(device) for tensor in inputs])
+    reused = [
+        entry["buffer"]
+        for key, entry in model._shape_cache.items()
+        if key[0] == "pinned"
+    ]
+    assert all(a is b for a, b in zip(reused, buffers))
+    assert outputs.device == model.device
+    assert torch.allclose(outputs, expected)
+
+    # inputs requiring gradients are copied directly
+    x_grad = x.clone().requires_grad_()
+    staged = model._stage_inputs([x_grad, decoder_inputs, constants])
+    assert staged[0].device == model.device
+    assert staged[0].grad_fn is not None
+
+    del inputs, model
+    torch.cuda.empty_cache()
+
+
+@import_or_fail("omegaconf")
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_HEALPixUNet_channels_last(
+    device,
+    unet_encoder_dict,
+    unet_decoder_dict,
+    test_data,
+    insolation_data,
+    constant_data,
+    pytestconfig,
+):
+    in_channels = 3
+    out_channels = 3
+    n_constants = 2
+    decoder_input_channels = 1
+    input_time_dim = 2
+    output_time_dim = 4
+    size = 16
+
+    fix_random_seeds(seed=42)
+    x = test_data(
+        time_dim=input_time_dim, channels=in_channels, img_size=size, device=device
+    )
+    decoder_inputs = insolation_data(
+        time_dim=output_time_dim, img_size=size, device=device
+    )
+    constants = constant_data(channels=n_constants, img_size=size, device=device)
+    inputs = [x, decoder_inputs, constants]
+
+    model = HEALPixUNet(
+        encoder=unet_encoder_dict,
+        decoder=unet_decoder_dict,
+        input_channels=in_channels,
+        output_channels=out_channels,
+        n_constants=n_constants,
+        decoder_input_channels=decoder_input_channels,
+        input_time_dim=input_time_dim,
+        output_time_dim=output_time_dim,
+        enable_nhwc=True,
+    ).to(device)
+
+    # every activation between the fold and the unfold, including the skip
+    # connections, should stay channels-last
+    nchw_modules = []
+
+    def check_memory_format(module, args, output):
+        if any(
+            isinstance(tensor, torch.Tensor)
+            and tensor.dim() == 4
+            and tensor.shape[1] > 1
+            and not tensor.is_contiguous(memory_format=torch.channels_last)
+            for tensor in (*args, output)
+        ):
+            nchw_modules.append(module)
+
+    for module in (model.encoder, model.decoder):
+        for submodule in module.modules():
+            submodule.register_forward_hook(check_memory_format)
+
+    outputs = model(inputs)
+    assert outputs.shape == (8, 12, output_time_dim, out_channels, size, size)
+    assert not nchw_modules
+
+    del inputs, model
+    torch.cuda.empty_cache()
@@ -55,7 +55,7 @@ def test_deterministic_sampler_output_type_and_shape(mock_net, pytestconfig):
 
 # Test for parameter validation
 @import_or_fail("cftime")
-@pytest.mark.parametrize("solver", ["invalid_solver", "euler", "heun"])
+@pytest.mark.parametrize("solver", ["invalid_solver", "euler", "heun", "dpmpp_2m"])
 def test_deterministic_sampler_solver_validation(mock_net, solver, pytestconfig):
     from physicsnemo.utils.diffusion import deterministic_sampler
 
@@ -175,7 +175,8 @@ def test_deterministic_sampler_scaling_validation(mock_net, scaling, pytestconfi
 
 # Test correctness with known ODE solution
 @import_or_fail("cftime")
-def test_deterministic_sampler_correctness(pytestconfig):
+@pytest.mark.parametrize("solver, num_steps", [("heun", 100), ("dpmpp_2m", 200)])
+def test_deterministic_sampler_correctness(solver, num_steps, pytestconfig):
     from physicsnemo.utils.diffusion import deterministic_sampler
 
     # Create a simple network that implements our ODE: dx/dt = -x ==> x(t) = exp(-t)
@@ -205,9 +206,10 @@ def test_deterministic_sampler_correctness(pytestconfig):
         net=net,
         latents=x0,
         img_lr=img_lr,
-        num_steps=100,
+        num_steps=num_steps,
         sigma_min=net.sigma_min,
         sigma_max=net.sigma_max,
+        solver=solver,
     )
 
     # Analytical solution of x(t) = exp(-t) at t=0 is 1
@@ -219,6 +221,41 @@ def test_deterministic_sampler_correctness(pytestconfig):
     )
 
 
+# Test that Parareal converges to the sequential integration
+@import_or_fail("cftime")
+@pytest.mark.parametrize("solver", ["euler", "heun"])
+def test_deterministic_sampler_parareal(solver, pytestconfig):
+    from physicsnemo.utils.diffusion import deterministic_sampler
+
+    class PerSampleSigmaNet(torch.nn.Module):
+        sigma_min = 0.002
+        sigma_max = 80.0
+
+        def forward(self, x, img_lr, sigma, class_labels=None):
+            # sigma can have a different value for each sample
+            sigma = torch.as_tensor(sigma).reshape(-1, 1, 1, 1)
+            return x / (1 + sigma**2).sqrt() + torch.tanh(img_lr)
+
+        def round_sigma(self, sigma):
+            return torch.as_tensor(sigma)
+
+    net = PerSampleSigmaNet()
+    latents = torch.randn(2, 3, 8, 8)
+    img_lr = torch.randn(2, 3, 8, 8)
+    kwargs = dict(num_steps=9, solver=solver, dtype=torch.float64)
+    expected = deterministic_sampler(net, latents, img_lr, **kwargs)
+
+    # 9 time-steps are grouped in 3 blocks: Parareal is exact after 3 iterations
+    output = deterministic_sampler(net, latents, img_lr, parareal_iters=3, **kwargs)
+    assert output.shape == latents.shape
+    assert torch.allclose(output, expected, rtol=1e-10, atol=1e-10)
+
+    with pytest.raises(ValueError):
+        deterministic_sampler(
+            net, latents, img_lr, parareal_iters=1, S_churn=10, **kwargs
+        )
+
+
 def setup_model_learnable_embd(img_resolution, C_x, C_cond, global_lr=False, seed=0):
     """
     Create a model with similar architecture to CorrDiff (learnable positional
@@ -285,10 +322,85 @@ def test_deterministic_sampler_full_domain_lead_time(device, pytestconfig):
     )
 
 
+# Test that channels last sampling gives the same results in channels last
+@import_or_fail("cftime")
+def test_deterministic_sampler_channels_last(pytestconfig):
+    from physicsnemo.utils.diffusion import deterministic_sampler
+
+    net = setup_model_learnable_embd((16, 16), C_x=3, C_cond=3).eval()
+    latents = torch.randn(1, 3, 16, 16)
+    img_lr = torch.randn(1, 3, 16, 16)
+    mean_hr = torch.randn(1, 3, 16, 16)
+    kwargs = dict(mean_hr=mean_hr, num_steps=2, lead_time_label=torch.tensor([1]))
+    expected = deterministic_sampler(net, latents, img_lr, **kwargs)
+    result = deterministic_sampler(net, latents, img_lr, channels_last=True, **kwargs)
+    assert result.is_contiguous(memory_format=torch.channels_last)
+    assert torch.allclose(result, expected, rtol=1e-5, atol=1e-5)
+
+
+@import_or_fail("cftime")
+def test_deterministic_sampler_net_compile(pytestconfig):
+    from physicsnemo.utils.diffusion import deterministic_sampler
+
+    # Preconditioner-like wrapper around a small network
+    class WrappedNet(torch.nn.Module):
+        def __init__(self, sigma_min=0.002, sigma_max=80.0):
+            super().__init__()
+            self.sigma_min = sigma_min
+            self.sigma_max = sigma_max
+            self.model = torch.nn.Conv2d(6, 3, 3, padding=1)
+
+        def forward(self, x, img_lr, sigma, class_labels=None):
+            return torch.tanh(self.model(torch.cat((x, img_lr), dim=1)))
+
+        def round_sigma(self, sigma):
+            return torch.as_tensor(sigma)
+
+    torch.manual_seed(0)
+    net = WrappedNet()
+    latents = torch.randn(1, 3, 16, 16)
+    img_lr = torch.randn(1, 3, 16, 16)
+    expected = deterministic_sampler(net, latents, img_lr, num_steps=4)
+    result = deterministic_sampler(
+        net, latents, img_lr, num_steps=4, net_compile_mode="default"
+    )
+    assert net._compiled
+    assert torch.allclose(result, expected, rtol=1e-3, atol=1e-3)
+
+
+# The test function for deterministic_sampler with compiled solver updates
+@import_or_fail("cftime")
+@pytest.mark.parametrize("solver", ["euler", "heun", "dpmpp_2m"])
+def test_deterministic_sampler_compile_solver(solver, pytestconfig):
+    from physicsnemo.utils.diffusion import deterministic_sampler
+
+    class TanhNet:
+        sigma_min = 0.002
+        sigma_max = 80.0
+
+        def __call__(self, x, img_lr, sigma, class_labels=None):
+            return torch.tanh(x + img_lr)
+
+        def round_sigma(self, sigma):
+            return torch.as_tensor(sigma)
+
+    torch._dynamo.reset()
+    net = TanhNet()
+    latents = torch.randn(1, 3, 8, 8)
+    img_lr = torch.randn(1, 3, 8, 8)
+    kwargs = dict(num_steps=4, solver=solver)
+    expected = deterministic_sampler(net, latents, img_lr, **kwargs)
+    result = deterministic_sampler(net, latents, img_lr, compile_solver=True, **kwargs)
+    assert torch.allclose(result, expected, rtol=1e-5, atol=1e-5)
+
+
 # The test function for edm_sampler with rectangular domain and patching
 @import_or_fail("cftime")
 @pytest.mark.parametrize("device", ["cuda:0", "cpu"])
-def test_deterministic_sampler_rectangle_patching_lead_time(device, pytestconfig):
+@pytest.mark.parametrize("compile_patching", [False, True])
+def test_deterministic_sampler_rectangle_patching_lead_time(
+    device, compile_patching, pytestconfig
+):
     from physicsnemo.utils.diffusion import deterministic_sampler
     from physicsnemo.utils.patching import GridPatching2D
 
@@ -323,6 +435,7 @@ def test_deterministic_sampler_rectangle_patching_lead_time(device, pytestconfig
         mean_hr=mean_hr,
         num_steps=2,
         lead_time_label=torch.tensor([1]),
+        compile_patching=compile_patching,
     )
 
     assert result_mean_hr.shape == latents.shape, (
@@ -330,6 +443,73 @@ def test_deterministic_sampler_rectangle_patching_lead_time(device, pytestconfig
     )
 
 
+# Test the patched sampler in inference mode, as run by diffusion_step, where
+# the positional embeddings with lead time are inference tensors
+@import_or_fail("cftime")
+def test_deterministic_sampler_patching_inference_mode(pytestconfig):
+    from physicsnemo.utils.diffusion import deterministic_sampler
+    from physicsnemo.utils.patching import GridPatching2D
+
+    img_shape_y, img_shape_x = 32, 32
+    net = setup_model_learnable_embd(
+        (img_shape_y, img_shape_x), C_x=3, C_cond=3, global_lr=True
+    )
+    latents = torch.randn(2, 3, img_shape_y, img_shape_x)
+    img_lr = torch.randn(2, 3, img_shape_y, img_shape_x)
+    patching = GridPatching2D(
+        img_shape=(img_shape_y, img_shape_x),
+        patch_shape=(32, 16),
+        overlap_pix=4,
+        boundary_pix=2,
+    )
+    kwargs = dict(
+        patching=patching,
+        mean_hr=torch.randn(2, 3, img_shape_y, img_shape_x),
+        num_steps=2,
+        lead_time_label=torch.tensor([1]),
+    )
+
+    expected = deterministic_sampler(net, latents, img_lr, **kwargs)
+    with torch.inference_mode():
+        result = deterministic_sampler(net, latents, img_lr, **kwargs)
+    assert torch.allclose(result, expected)
+
+
+# Test that gradients flow through the sampler unless differentiable=False, and
+# that the training mode of the network is not changed
+@import_or_fail("cftime")
+@pytest.mark.parametrize("differentiable", [None, True, False])
+def test_deterministic_sampler_differentiable(differentiable, pytestconfig):
+    from physicsnemo.utils.diffusion import deterministic_sampler
+
+    net = setup_model_learnable_embd((16, 16), C_x=3, C_cond=3)
+    net.train()
+    modes = []
+    net.register_forward_pre_hook(lambda module, args: modes.append(module.training))
+    latents = torch.randn(1, 3, 16, 16, requires_grad=True)
+    kwargs = {} if differentiable is None else {"differentiable": differentiable}
+    result = deterministic_sampler(
+        net=net,
+        latents=latents,
+        img_lr=torch.randn(1, 3, 16, 16),
+        mean_hr=torch.randn(1, 3, 16, 16),
+        num_steps=2,
+        lead_time_label=torch.tensor([1]),
+        **kwargs,
+    )
+    assert modes and all(modes)
+    assert net.training
+
+    if differentiable is False:
+        assert not result.requires_grad
+        return
+    result.sum().backward()
+    assert latents.grad is not None
+    assert all(
+        param.grad is not None for param in net.parameters() if param.requires_grad
+    )
+
+
 # Test that the deterministic sampler is differentiable with rectangular patching
 # (tests differentiation through the patching and fusing)
 @import_or_fail("cftime")
@@ -378,6 +558,7 @@ def test_deterministic_sampler_patching_differentiable(device, pytestconfig):
         mean_hr=e * mean_hr + f,
         num_steps=2,
         lead_time_label=torch.tensor([1]),
+        differentiable=True,
     )
 
     assert result_mean_hr.shape == latents.shape, (
@@ -219,3 +219,247 @@ def test_compiled_model_checkpointing(
     new_output = uncompiled_model(sample_input).detach().cpu()
 
     assert torch.allclose(original_output, new_output, rtol=rtol, atol=atol)
+
+
+@pytest.mark.parametrize("device", ["cpu", "cuda:0"])
+def test_async_checkpointing(tmp_path, device):
+    """Ensure asynchronous saves snapshot the state at the time of the call."""
+
+    if device.startswith("cuda") and not torch.cuda.is_available():
+        pytest.skip("CUDA not available in the test environment")
+
+    from physicsnemo.launch.utils import load_checkpoint, save_checkpoint
+
+    model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 4)).to(device)
+    optimizer = torch.optim.Adam(model.parameters())
+    model(torch.randn(2, 4, device=device)).sum().backward()
+    optimizer.step()
+
+    expected = {k: v.detach().cpu().clone() for k, v in model.state_dict().items()}
+    ckpt_dir = tmp_path / "async_ckpt"
+    save_checkpoint(
+        ckpt_dir.as_posix(),
+        models=[model],
+        optimizer=optimizer,
+        epoch=1,
+        async_save=True,
+    )
+    # Updates after the call must not leak into the checkpoint
+    with torch.no_grad():
+        for param in model.parameters():
+            param.add_(1.0)
+
+    loaded_model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 4)).to(device)
+    loaded_optimizer = torch.optim.Adam(loaded_model.parameters())
+    epoch = load_checkpoint(
+        ckpt_dir.as_posix(),
+        models=[loaded_model],
+        optimizer=loaded_optimizer,
+        device=device,
+    )
+
+    assert epoch == 1
+    for key, value in loaded_model.state_dict().items():
+        assert torch.equal(value.cpu(), expected[key])
+    assert len(loaded_optimizer.state_dict()["state"]) == len(list(model.parameters()))
+
+
+def test_incremental_checkpointing(tmp_path):
+    """Ensure incremental saves only write changed tensors and load in full."""
+
+    from physicsnemo.launch.utils import load_checkpoint, save_checkpoint
+
+    model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 4))
+    model[0].requires_grad_(False)
+    optimizer = torch.optim.SGD(model[2].parameters(), lr=0.1)
+
+    ckpt_dir = tmp_path / "incremental_ckpt"
+    for _ in range(2):
+        model(torch.randn(2, 4)).sum().backward()
+        optimizer.step()
+        save_checkpoint(ckpt_dir.as_posix(), models=[model], incremental=True)
+
+    # The frozen layer is only written to the first, full checkpoint
+    delta = torch.load(ckpt_dir / "Sequential.0.1.pt")
+    assert set(delta["state_dict"]) == {"2.weight", "2.bias"}
+
+    loaded_model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 4))
+    load_checkpoint(ckpt_dir.as_posix(), models=[loaded_model])
+    for key, value in loaded_model.state_dict().items():
+        assert torch.equal(value, model.state_dict()[key])
+
+
+def test_incremental_checkpointing_base(tmp_path):
+    """Ensure incremental saves are not merged onto a missing or overwritten base."""
+
+    from physicsnemo.launch.utils import load_checkpoint, save_checkpoint
+
+    model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 4))
+    model[0].requires_grad_(False)
+    ckpt_dir = tmp_path / "incremental_base_ckpt"
+    for _ in range(2):
+        with torch.no_grad():
+            model[2].weight.add_(1.0)
+        save_checkpoint(ckpt_dir.as_posix(), models=[model], incremental=True)
+    base_file = ckpt_dir / "Sequential.0.0.pt"
+    delta = torch.load(ckpt_dir / "Sequential.0.1.pt")
+    assert delta["__incremental_base__"] == base_file.name
+    assert delta["keys"] == list(model.state_dict())
+
+    # Overwriting the base changes what the incremental save decodes to
+    other_model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 4))
+    base_state_dict = torch.load(base_file)
+    torch.save(other_model.state_dict(), base_file)
+    loaded_model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 4))
+    with pytest.raises(ValueError, match="was overwritten"):
+        load_checkpoint(ckpt_dir.as_posix(), models=[loaded_model], epoch=1)
+
+    # The base is still readable on its own
+    torch.save(base_state_dict, base_file)
+    load_checkpoint(ckpt_dir.as_posix(), models=[loaded_model], epoch=0)
+    for key, value in loaded_model.state_dict().items():
+        assert torch.equal(value, base_state_dict[key])
+
+    base_file.unlink()
+    with pytest.raises(ValueError, match="does not exist"):
+        load_checkpoint(ckpt_dir.as_posix(), models=[loaded_model], epoch=1)
+
+
+def test_sharded_quantized_optimizer_checkpointing(tmp_path, monkeypatch):
+    """Ensure sharded and quantized optimizer states round trip on the CPU."""
+
+    from physicsnemo.launch.utils import checkpoint, load_checkpoint, save_checkpoint
+
+    # Two data parallel ranks, simulated in turn by this process
+    class MockDistributedManager:
+        distributed = True
+        world_size = 2
+        rank = 0
+        group_names = []
+
+        @staticmethod
+        def is_initialized():
+            return True
+
+    monkeypatch.setattr(checkpoint, "DistributedManager", MockDistributedManager)
+    monkeypatch.setattr(
+        torch.distributed, "broadcast_object_list", lambda object_list, src: None
+    )
+    monkeypatch.setattr(torch.distributed, "barrier", lambda: None)
+
+    model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 4))
+    optimizer = torch.optim.Adam(model.parameters())
+    model(torch.randn(2, 4)).sum().backward()
+    optimizer.step()
+    expected = optimizer.state_dict()["state"]
+
+    ckpt_dir = tmp_path / "sharded_ckpt"
+    for rank in (1, 0):
+        MockDistributedManager.rank = rank
+        save_checkpoint(
+            ckpt_dir.as_posix(),
+            models=[model],
+            optimizer=optimizer,
+            epoch=1,
+            quantize_optimizer=True,
+            sharded=True,
+        )
+    # The state of the optimizer itself is not quantized
+    assert optimizer.state_dict()["state"][0]["exp_avg"].dtype == torch.float32
+
+    checkpoint_dict = torch.load(ckpt_dir / "checkpoint.0.1.pt", weights_only=False)
+    assert checkpoint_dict["optimizer_shards"] == 2
+    assert checkpoint_dict["optimizer_state_dict"]["state"] == {}
+    for rank in range(2):
+        shard = torch.load(ckpt_dir / f"checkpoint.0.1.pt.shard{rank}of2")["state"]
+        # Every other parameter is saved by each rank, with bf16 moment estimates
+        assert set(shard) == {i for i in expected if i % 2 == rank}
+        for param_state in shard.values():
+            assert param_state["exp_avg"].dtype == torch.bfloat16
+            assert param_state["exp_avg_sq"].dtype == torch.bfloat16
+
+    # The checkpoint is loaded by any number of ranks
+    MockDistributedManager.world_size = 1
+    loaded_model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 4))
+    loaded_optimizer = torch.optim.Adam(loaded_model.parameters())
+    epoch = load_checkpoint(
+        ckpt_dir.as_posix(), models=[loaded_model], optimizer=loaded_optimizer
+    )
+    assert epoch == 1
+    loaded = loaded_optimizer.state_dict()["state"]
+    assert set(loaded) == set(expected)
+    for param_id, param_state in expected.items():
+        for key in ("exp_avg", "exp_avg_sq"):
+            assert loaded[param_id][key].dtype == torch.float32
+            assert torch.allclose(
+                loaded[param_id][key], param_state[key], rtol=1e-2, atol=1e-6
+            )
+        assert torch.equal(loaded[param_id]["step"], param_state["step"])
+
+
+def test_checkpointing_releases_models(tmp_path):
+    """Ensure saving a checkpoint does not keep the saved objects alive."""
+
+    import gc
+    import weakref
+
+    from physicsnemo.launch.utils import checkpoint, save_checkpoint
+
+    model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 4))
+    optimizer = torch.optim.Adam(model.parameters())
+    ckpt_dir = tmp_path / "release_ckpt"
+    save_checkpoint(ckpt_dir.as_posix(), models=[model], optimizer=optimizer, epoch=0)
+    # The pinned staging buffers of synchronous saves are released after the save
+    assert model not in checkpoint._pinned_buffers
+    assert optimizer not in checkpoint._pinned_buffers
+
+    # unless they are kept for the next saves of the same objects
+    for epoch in range(1, 3):
+        save_checkpoint(
+            ckpt_dir.as_posix(),
+            models=[model],
+            optimizer=optimizer,
+            epoch=epoch,
+            reuse_pinned_buffers=True,
+        )
+    assert model in checkpoint._pinned_buffers
+    assert optimizer in checkpoint._pinned_buffers
+    num_buffers = len(checkpoint._pinned_buffers)
+
+    model_ref = weakref.ref(model)
+    optimizer_ref = weakref.ref(optimizer)
+    del model, optimizer
+    gc.collect()
+    assert model_ref() is None
+    assert optimizer_ref() is None
+    # and released along with them
+    assert len(checkpoint._pinned_buffers) == num_buffers - 2
+
+
+def test_load_checkpoint_metadata(tmp_path):
+    """Ensure the checkpoint metadata can be read without the checkpoint."""
+
+    from physicsnemo.launch.utils import load_checkpoint_metadata, save_checkpoint
+
+    model = nn.Linear(4, 4)
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+    ckpt_dir = tmp_path / "metadata_ckpt"
+    save_checkpoint(
+        ckpt_dir.as_posix(),
+        models=[model],
+        optimizer=optimizer,
+        epoch=3,
+        metadata={"model_type": "MLP"},
+    )
+
+    assert (ckpt_dir / "checkpoint.0.3.pt.json").is_file()
+    epoch, metadata = load_checkpoint_metadata(ckpt_dir.as_posix())
+    assert epoch == 3
+    assert metadata == {"model_type": "MLP"}
+
+    # Checkpoints without metadata file fall back to the checkpoint itself
+    (ckpt_dir / "checkpoint.0.3.pt.json").unlink()
+    assert load_checkpoint_metadata(ckpt_dir.as_posix(), epoch=3) == (
+        3,
+        {"model_type": "MLP"},
+    )
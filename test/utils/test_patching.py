@@ -18,68 +18,144 @@
 import pytest
 import torch
 import validate_utils
-from einops import rearrange, repeat
 from pytest_utils import import_or_fail
 
+# The CUDA tests are skipped on machines without a GPU
+DEVICES = [
+    pytest.param(
+        "cuda:0",
+        marks=pytest.mark.skipif(
+            not torch.cuda.is_available(), reason="CUDA is not available"
+        ),
+    ),
+    "cpu",
+]
+
+
+@pytest.fixture(autouse=True)
+def _single_thread(device):
+    # The CPU tests operate on tiny images, for which the intra-op thread pool
+    # costs more than it saves
+    if device != "cpu":
+        yield
+        return
+    num_threads = torch.get_num_threads()
+    torch.set_num_threads(1)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(num_threads)
+
+
+@pytest.fixture(scope="module")
+def rand_pool():
+    """
+    Random images of shape (2, 3, 64, 64), drawn once per device and shared
+    by the tests that do not compare against golden files. Tests slice the
+    pool to the shape they need.
+    """
+    pools = {}
+
+    def get(device):
+        if device not in pools:
+            generator = torch.Generator(device).manual_seed(0)
+            pools[device] = torch.rand(2, 3, 64, 64, generator=generator, device=device)
+        return pools[device]
+
+    return get
+
+
+def _reference_patches(x, p_h, p_w, interp):
+    """
+    Reference output of image_batching without overlap and boundary pixels:
+    the non-overlapping patches of x, ordered along the width first, each
+    concatenated with interp along the channel dimension. interp must have a
+    batch size of 1.
+    """
+    b, c, h, w = x.shape
+    nb_p_h, nb_p_w = h // p_h, w // p_w
+    # unfold: (b, c * p_h * p_w, nb_p_h * nb_p_w)
+    patches = (
+        torch.nn.functional.unfold(x, kernel_size=(p_h, p_w), stride=(p_h, p_w))
+        .view(b, c, p_h, p_w, nb_p_h, nb_p_w)
+        .permute(0, 5, 4, 1, 2, 3)
+        .reshape(b * nb_p_w * nb_p_h, c, p_h, p_w)
+    )
+    return torch.cat((patches, interp.expand(patches.shape[0], -1, -1, -1)), dim=1)
+
+
+# Test cases of test_grid_patching_2d:
+# (H, W, H_p, W_p, overlap_pix, boundary_pix, N_patches)
+GRID_PATCHING_2D_CASES = [
+    (8, 8, 4, 4, 0, 0, 4),  # Square image, no overlap/boundary
+    (16, 8, 4, 4, 0, 0, 8),  # Rectangular image, no overlap/boundary
+    (16, 16, 10, 10, 4, 2, 16),  # Square image, minimal overlap/boundary
+    (32, 16, 16, 12, 6, 2, 16),  # Rectangular, larger overlap/boundary
+]
+
 
 @import_or_fail("cftime")
-@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
-def test_grid_patching_2d(pytestconfig, device):
+@pytest.mark.parametrize("device", DEVICES)
+@pytest.mark.parametrize("i", range(len(GRID_PATCHING_2D_CASES)))
+def test_grid_patching_2d(pytestconfig, device, i):
     from physicsnemo.utils.patching import GridPatching2D
 
-    torch.manual_seed(0)
-    # Test cases: (H, W, H_p, W_p, overlap_pix, boundary_pix, N_patches)
     B = 2
-    test_cases = [
-        (8, 8, 4, 4, 0, 0, 4),  # Square image, no overlap/boundary
-        (16, 8, 4, 4, 0, 0, 8),  # Rectangular image, no overlap/boundary
-        (16, 16, 10, 10, 4, 2, 16),  # Square image, minimal overlap/boundary
-        (32, 16, 16, 12, 6, 2, 16),  # Rectangular, larger overlap/boundary
-    ]
+    H, W, H_p, W_p, overlap_pix, boundary_pix, P = GRID_PATCHING_2D_CASES[i]
+    error_msg = f"Failed on {device} with test case {i}"
 
-    for i, (H, W, H_p, W_p, overlap_pix, boundary_pix, P) in enumerate(test_cases):
-        error_msg = f"Failed on {device} with test case {i}"
+    patching = GridPatching2D(
+        img_shape=(H, W),
+        patch_shape=(H_p, W_p),
+        overlap_pix=overlap_pix,
+        boundary_pix=boundary_pix,
+    )
 
-        patching = GridPatching2D(
-            img_shape=(H, W),
-            patch_shape=(H_p, W_p),
-            overlap_pix=overlap_pix,
-            boundary_pix=boundary_pix,
-        )
+    overlap_count = GridPatching2D.get_overlap_count(
+        patch_shape=(H_p, W_p),
+        img_shape=(H, W),
+        overlap_pix=overlap_pix,
+        boundary_pix=boundary_pix,
+    )
+    assert validate_utils.validate_accuracy(
+        overlap_count,
+        file_name=f"grid_patching_2d_overlap_count_test{i}.pth",
+        atol=1e-5,
+    ), error_msg
+
+    # The golden files were generated by drawing the inputs of all the test
+    # cases in order after seeding, so the inputs of the previous cases are
+    # drawn (and discarded) first
+    torch.manual_seed(0)
+    for H_prev, W_prev, *_ in GRID_PATCHING_2D_CASES[:i]:
+        torch.randn(B, 3, H_prev, W_prev)
+    input_tensor = torch.randn(B, 3, H, W).to(device).float().requires_grad_(True)
+    patched_input = patching.apply(input_tensor)
+    assert patched_input.shape == (P * B, 3, H_p, W_p), error_msg
+    assert validate_utils.validate_accuracy(
+        patched_input,
+        file_name=f"grid_patching_2d_apply_test{i}.pth",
+        atol=1e-5,
+    ), error_msg
+
+    fused_input = patching.fuse(patched_input, batch_size=B)
+    assert fused_input.shape == (B, 3, H, W)
+    torch.testing.assert_close(
+        fused_input,
+        input_tensor,
+        rtol=1e-5,
+        atol=1e-5,
+        msg=lambda msg: f"{error_msg}\n{msg}",
+    )
 
-        overlap_count = GridPatching2D.get_overlap_count(
-            patch_shape=(H_p, W_p),
-            img_shape=(H, W),
-            overlap_pix=overlap_pix,
-            boundary_pix=boundary_pix,
-        )
-        assert validate_utils.validate_accuracy(
-            overlap_count,
-            file_name=f"grid_patching_2d_overlap_count_test{i}.pth",
-            atol=1e-5,
-        ), error_msg
-
-        input_tensor = torch.randn(B, 3, H, W).to(device).float().requires_grad_(True)
-        patched_input = patching.apply(input_tensor)
-        assert patched_input.shape == (P * B, 3, H_p, W_p), error_msg
-        assert validate_utils.validate_accuracy(
-            patched_input,
-            file_name=f"grid_patching_2d_apply_test{i}.pth",
-            atol=1e-5,
-        ), error_msg
-
-        fused_input = patching.fuse(patched_input, batch_size=B)
-        assert fused_input.shape == (B, 3, H, W)
-        assert torch.allclose(fused_input, input_tensor, atol=1e-5), error_msg
-
-        # Make sure that image_batching is differentiable
-        loss = fused_input.sum()
-        loss.backward()
-        assert input_tensor.grad is not None, error_msg
+    # Make sure that image_batching is differentiable
+    loss = fused_input.sum()
+    loss.backward()
+    assert input_tensor.grad is not None, error_msg
 
 
 @import_or_fail("cftime")
-@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+@pytest.mark.parametrize("device", DEVICES)
 def test_image_fuse_basic(pytestconfig, device):
     from physicsnemo.utils.patching import image_fuse
 
@@ -90,10 +166,9 @@ def test_image_fuse_basic(pytestconfig, device):
         boundary_pix = 0
 
         input_tensor = (
-            torch.arange(1, img_shape_y * img_shape_x + 1)
-            .view(1, 1, img_shape_y, img_shape_x)
-            .to(device)
-            .float()
+            torch.arange(
+                1, img_shape_y * img_shape_x + 1, dtype=torch.float32, device=device
+            ).view(1, 1, img_shape_y, img_shape_x)
         ).requires_grad_(True)
         fused_image = image_fuse(
             input_tensor,
@@ -105,9 +180,7 @@ def test_image_fuse_basic(pytestconfig, device):
         )
         assert fused_image.shape == (batch_size, 1, img_shape_y, img_shape_x)
         expected_output = input_tensor
-        assert torch.allclose(fused_image, expected_output, atol=1e-5), (
-            "Output does not match expected output."
-        )
+        torch.testing.assert_close(fused_image, expected_output, rtol=1e-5, atol=1e-5)
 
         # Make sure that image_fuse is differentiable
         loss = fused_image.sum()
@@ -116,15 +189,15 @@ def test_image_fuse_basic(pytestconfig, device):
 
 
 @import_or_fail("cftime")
-@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
-def test_image_fuse_with_boundary(pytestconfig, device):
+@pytest.mark.parametrize("device", DEVICES)
+def test_image_fuse_with_boundary(pytestconfig, device, rand_pool):
     from physicsnemo.utils.patching import image_fuse
 
     # Test with boundary pixels
     overlap_pix = 0
     boundary_pix = 1
 
-    input_tensor = (torch.randn(1, 1, 8, 6).to(device).float()).requires_grad_(True)
+    input_tensor = rand_pool(device)[:1, :1, :8, :6].clone().requires_grad_(True)
     fused_image = image_fuse(
         input_tensor,
         img_shape_y=6,
@@ -137,9 +210,7 @@ def test_image_fuse_with_boundary(pytestconfig, device):
     expected_output = input_tensor[
         :, :, boundary_pix:-boundary_pix, boundary_pix:-boundary_pix
     ]
-    assert torch.allclose(fused_image, expected_output, atol=1e-5), (
-        "Output with boundary does not match expected output."
-    )
+    torch.testing.assert_close(fused_image, expected_output, rtol=1e-5, atol=1e-5)
 
     # Make sure that image_fuse is differentiable
     loss = fused_image.sum()
@@ -148,65 +219,76 @@ def test_image_fuse_with_boundary(pytestconfig, device):
 
 
 @import_or_fail("cftime")
-@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
-def test_image_fuse_with_multiple_batches(pytestconfig, device):
+@pytest.mark.parametrize("device", DEVICES)
+@pytest.mark.parametrize(
+    "img_shape_y, img_shape_x, patch_shape_y, patch_shape_x, overlap_pix, boundary_pix",
+    [
+        (32, 32, 16, 16, 0, 0),  # Square image, no overlap/boundary
+        (64, 32, 32, 16, 0, 0),  # Rectangular image, no overlap/boundary
+        (48, 48, 16, 16, 4, 2),  # Square image, minimal overlap/boundary
+        (64, 48, 32, 16, 6, 2),  # Rectangular, larger overlap/boundary
+    ],
+)
+def test_image_fuse_with_multiple_batches(
+    pytestconfig,
+    device,
+    rand_pool,
+    img_shape_y,
+    img_shape_x,
+    patch_shape_y,
+    patch_shape_x,
+    overlap_pix,
+    boundary_pix,
+):
     from physicsnemo.utils.patching import image_batching, image_fuse
 
     # Test with multiple batches
     batch_size = 2
 
-    # Test cases: (img_shape_y, img_shape_x, patch_shape_y, patch_shape_x, overlap_pix, boundary_pix)
-    test_cases = [
-        (32, 32, 16, 16, 0, 0),  # Square image, no overlap/boundary
-        (64, 32, 32, 16, 0, 0),  # Rectangular image, no overlap/boundary
-        (48, 48, 16, 16, 4, 2),  # Square image, minimal overlap/boundary
-        (64, 48, 32, 16, 6, 2),  # Rectangular, larger overlap/boundary
-    ]
+    # Create original test image
+    original_image = (
+        rand_pool(device)[:batch_size, :, :img_shape_y, :img_shape_x]
+        .clone()
+        .requires_grad_(True)
+    )
 
-    for (
+    # Apply image_batching to split the image into patches
+    batched_images = image_batching(
+        original_image, patch_shape_y, patch_shape_x, overlap_pix, boundary_pix
+    )
+
+    # Apply image_fuse to reconstruct the image from patches
+    fused_image = image_fuse(
+        batched_images,
         img_shape_y,
         img_shape_x,
-        patch_shape_y,
-        patch_shape_x,
+        batch_size,
         overlap_pix,
         boundary_pix,
-    ) in test_cases:
-        # Create original test image
-        original_image = (
-            torch.rand(batch_size, 3, img_shape_y, img_shape_x).to(device).float()
-        ).requires_grad_(True)
-
-        # Apply image_batching to split the image into patches
-        batched_images = image_batching(
-            original_image, patch_shape_y, patch_shape_x, overlap_pix, boundary_pix
-        )
-
-        # Apply image_fuse to reconstruct the image from patches
-        fused_image = image_fuse(
-            batched_images,
-            img_shape_y,
-            img_shape_x,
-            batch_size,
-            overlap_pix,
-            boundary_pix,
-        )
+    )
 
-        # Verify that image_fuse reverses image_batching
-        assert torch.allclose(fused_image, original_image, atol=1e-5), (
+    # Verify that image_fuse reverses image_batching
+    torch.testing.assert_close(
+        fused_image,
+        original_image,
+        rtol=1e-5,
+        atol=1e-5,
+        msg=lambda msg: (
             f"Failed on {device}: img=({img_shape_y},{img_shape_x}), "
             f"patch=({patch_shape_y},{patch_shape_x}), "
-            f"overlap={overlap_pix}, boundary={boundary_pix}"
-        )
+            f"overlap={overlap_pix}, boundary={boundary_pix}\n{msg}"
+        ),
+    )
 
-        # Make sure that image_batching is differentiable
-        loss = fused_image.sum()
-        loss.backward()
+    # Make sure that image_batching is differentiable
+    loss = fused_image.sum()
+    loss.backward()
 
-        assert original_image.grad is not None
+    assert original_image.grad is not None
 
 
 @import_or_fail("cftime")
-@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+@pytest.mark.parametrize("device", DEVICES)
 def test_image_batching_basic(pytestconfig, device):
     from physicsnemo.utils.patching import image_batching
 
@@ -217,7 +299,7 @@ def test_image_batching_basic(pytestconfig, device):
     boundary_pix = 0
 
     input_tensor = (
-        torch.arange(1, 17).view(1, 1, 4, 4).to(device).float()
+        torch.arange(1, 17, dtype=torch.float32, device=device).view(1, 1, 4, 4)
     ).requires_grad_(True)
     batched_images = image_batching(
         input_tensor,
@@ -228,9 +310,7 @@ def test_image_batching_basic(pytestconfig, device):
     )
     assert batched_images.shape == (batch_size, 1, patch_shape_y, patch_shape_x)
     expected_output = input_tensor
-    assert torch.allclose(batched_images, expected_output, atol=1e-5), (
-        "Batched images do not match expected output."
-    )
+    torch.testing.assert_close(batched_images, expected_output, rtol=1e-5, atol=1e-5)
 
     # Make sure that image_batching is differentiable
     loss = batched_images.sum()
@@ -239,8 +319,8 @@ def test_image_batching_basic(pytestconfig, device):
 
 
 @import_or_fail("cftime")
-@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
-def test_image_batching_with_boundary(pytestconfig, device):
+@pytest.mark.parametrize("device", DEVICES)
+def test_image_batching_with_boundary(pytestconfig, device, rand_pool):
     from physicsnemo.utils.patching import image_batching
 
     # Test with boundary pixels, no overlap, no input_interp
@@ -249,7 +329,7 @@ def test_image_batching_with_boundary(pytestconfig, device):
     overlap_pix = 0
     boundary_pix = 1
 
-    input_tensor = (torch.rand(1, 1, 6, 4).to(device).float()).requires_grad_(True)
+    input_tensor = rand_pool(device)[:1, :1, :6, :4].clone().requires_grad_(True)
     batched_images = image_batching(
         input_tensor,
         patch_shape_y,
@@ -265,9 +345,7 @@ def test_image_batching_with_boundary(pytestconfig, device):
     )
 
     assert batched_images.shape == (1, 1, patch_shape_y, patch_shape_x)
-    assert torch.allclose(batched_images, expected_output, atol=1e-5), (
-        "Batched images with boundary do not match expected output."
-    )
+    torch.testing.assert_close(batched_images, expected_output, rtol=1e-5, atol=1e-5)
 
     # Make sure that image_batching is differentiable
     loss = batched_images.sum()
@@ -276,8 +354,11 @@ def test_image_batching_with_boundary(pytestconfig, device):
 
 
 @import_or_fail("cftime")
-@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
-def test_image_batching_with_input_interp(device, pytestconfig):
+@pytest.mark.parametrize("device", DEVICES)
+@pytest.mark.parametrize("img_shape_y, img_shape_x", [(4, 4), (16, 8)])
+def test_image_batching_with_input_interp(
+    device, pytestconfig, img_shape_y, img_shape_x
+):
     from physicsnemo.utils.patching import image_batching
 
     # Test with input_interp tensor
@@ -285,56 +366,36 @@ def test_image_batching_with_input_interp(device, pytestconfig):
     overlap_pix = 0
     boundary_pix = 0
 
-    for img_shape_y, img_shape_x in ((4, 4), (16, 8)):
-        img_size = img_shape_y * img_shape_x
-        patch_num = (img_shape_y // patch_shape_y) * (img_shape_x // patch_shape_x)
-        input_tensor = (
-            torch.arange(1, img_size + 1)
-            .view(1, 1, img_shape_y, img_shape_x)
-            .to(device)
-            .float()
-        ).requires_grad_(True)
-        input_interp = (
-            torch.arange(-patch_shape_y * patch_shape_x, 0)
-            .view(1, 1, patch_shape_y, patch_shape_x)
-            .to(device)
-            .float()
-        ).requires_grad_(True)
-        batched_images = image_batching(
-            input_tensor,
-            patch_shape_y,
-            patch_shape_x,
-            overlap_pix,
-            boundary_pix,
-            input_interp=input_interp,
-        )
-        assert batched_images.shape == (patch_num, 2, patch_shape_y, patch_shape_x)
-
-        # Define expected_output using einops operations
-        expected_output = torch.cat(
-            (
-                rearrange(
-                    input_tensor,
-                    "b c (nb_p_h p_h) (nb_p_w p_w) -> (b nb_p_w nb_p_h) c p_h p_w",
-                    p_h=patch_shape_y,
-                    p_w=patch_shape_x,
-                ),
-                repeat(
-                    input_interp,
-                    "b c p_h p_w -> (b nb_p_w nb_p_h) c p_h p_w",
-                    nb_p_h=img_shape_y // patch_shape_y,
-                    nb_p_w=img_shape_x // patch_shape_x,
-                ),
-            ),
-            dim=1,
+    img_size = img_shape_y * img_shape_x
+    patch_num = (img_shape_y // patch_shape_y) * (img_shape_x // patch_shape_x)
+    input_tensor = (
+        torch.arange(1, img_size + 1, dtype=torch.float32, device=device).view(
+            1, 1, img_shape_y, img_shape_x
         )
+    ).requires_grad_(True)
+    input_interp = (
+        torch.arange(
+            -patch_shape_y * patch_shape_x, 0, dtype=torch.float32, device=device
+        ).view(1, 1, patch_shape_y, patch_shape_x)
+    ).requires_grad_(True)
+    batched_images = image_batching(
+        input_tensor,
+        patch_shape_y,
+        patch_shape_x,
+        overlap_pix,
+        boundary_pix,
+        input_interp=input_interp,
+    )
+    assert batched_images.shape == (patch_num, 2, patch_shape_y, patch_shape_x)
 
-        assert torch.allclose(batched_images, expected_output, atol=1e-5), (
-            "Batched images with input_interp do not match expected output."
-        )
+    expected_output = _reference_patches(
+        input_tensor, patch_shape_y, patch_shape_x, input_interp
+    )
 
-        # Make sure that image_batching is differentiable
-        loss = batched_images.sum()
-        loss.backward()
-        assert input_interp.grad is not None
-        assert input_tensor.grad is not None
+    torch.testing.assert_close(batched_images, expected_output, rtol=1e-5, atol=1e-5)
+
+    # Make sure that image_batching is differentiable
+    loss = batched_images.sum()
+    loss.backward()
+    assert input_interp.grad is not None
+    assert input_tensor.grad is not None
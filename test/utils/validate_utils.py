@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import logging
 from pathlib import Path
 from typing import Tuple, Union
@@ -115,6 +116,32 @@ def save_output(output: Union[Tensor, Tuple[Tensor, ...]], file_name: Path):
     torch.save(output_dict, file_name)
 
 
+@functools.lru_cache(maxsize=16)
+def _load_cached_output(file_name: Path) -> Tuple[Tensor, ...]:
+    """Loads the target output stored in a file, cached by ``load_output``"""
+    tensor_dict = torch.load(str(file_name), map_location="cpu", weights_only=True)
+    return tuple(tensor_dict.values())
+
+
+def load_output(file_name: Path) -> Tuple[Tensor, ...]:
+    """Loads the target output stored in a file. Recently loaded outputs are
+    cached, since the same target is usually validated on several devices or
+    by several test cases. Copies of the cached tensors are returned, so that
+    in-place updates by a test do not affect the others.
+
+    Parameters
+    ----------
+    file_name : Path
+        File path
+
+    Returns
+    -------
+    Tuple[Tensor, ...]
+        Target output tensors, on the CPU
+    """
+    return tuple(value.clone() for value in _load_cached_output(file_name))
+
+
 @torch.no_grad()
 def validate_accuracy(
     output: Tensor,
@@ -167,7 +194,6 @@ def validate_accuracy(
         )
     # Load tensor dictionary and check
     else:
-        tensor_dict = torch.load(str(file_name))
-        output_target = tuple([value.to(device) for value in tensor_dict.values()])
+        output_target = tuple([value.to(device) for value in load_output(file_name)])
 
         return compare_output(output, output_target, rtol, atol)